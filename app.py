@@ -1,7 +1,41 @@
 import streamlit as st
+from config import Config, PERFORMANCE_PROFILES
+from resource_manager import get_resource_manager
+from mom_jobs import get_job_queue, EXCEL_MOM_JOB
+from job_queue import JOB_DONE, JOB_FAILED, JOB_CANCELLED
+from mom_archive import get_archive
+from archive_view import render_archive_view
 from generator import MoMGenerator
+from prefetch import UploadPrefetcher, get_extraction_cache
 from datetime import datetime
 import pandas as pd
+import time
+
+def show_job(job_queue, job_id):
+    """Render the state of a background job, polling until it finishes"""
+    job = job_queue.get(job_id)
+    if job is None:
+        st.session_state.pop("job_id", None)
+        st.query_params.pop("job", None)
+        return
+
+    if job["status"] == JOB_DONE:
+        mom_data = job["result"]["mom_data"]
+        st.json(mom_data)
+        with open(job["result"]["exports"]["xlsx"], "rb") as f:
+            st.download_button("📥 Download Excel", f.read(), file_name=f"MoM_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+    elif job["status"] == JOB_FAILED:
+        st.error(f"Generation failed: {job['error']}")
+    elif job["status"] == JOB_CANCELLED:
+        st.info("Generation cancelled")
+    else:
+        st.progress(job["progress"], text=job["message"] or "Waiting for a worker...")
+        if st.button("✖ Cancel"):
+            job_queue.cancel(job_id)
+            st.rerun()
+        # Poll again; the job keeps running even if the user interacts meanwhile
+        time.sleep(1)
+        st.rerun()
 
 def main():
     st.title("📝 Minutes of Meeting Generator")
@@ -10,18 +44,45 @@ def main():
         if not api_key:
             st.warning("Please enter your Gemini API key to proceed")
             st.stop()
+        profile = st.selectbox("Performance profile", list(PERFORMANCE_PROFILES),
+                               index=list(PERFORMANCE_PROFILES).index(Config.PERFORMANCE_PROFILE),
+                               help="fast: quicker OCR and a lighter model; accurate: full layout OCR and the strongest model")
+        config = Config(profile)
+        # Validation is cached per key, so this only hits the API on first use
+        if not get_resource_manager().validate_api_key(api_key, model=config.GEMINI_MODEL):
+            st.error("Invalid Gemini API key")
+            st.stop()
+        view = st.radio("View", ["Generate", "Archive"])
 
-    mom_gen = MoMGenerator(api_key)
-    uploaded_files = st.file_uploader("Upload meeting files", type=['txt', 'pdf', 'docx', 'png', 'jpg', 'jpeg'], accept_multiple_files=True)
+    if view == "Archive":
+        render_archive_view(get_archive())
+        return
+
+    job_queue = get_job_queue()
+    uploaded_files = st.file_uploader("Upload meeting files", type=['txt', 'pdf', 'docx', 'png', 'jpg', 'jpeg', 'tiff', 'tif', 'bmp'], accept_multiple_files=True)
+
+    # Start extracting as soon as files are uploaded; removed files are cancelled
+    prefetcher = st.session_state.get("prefetcher")
+    if prefetcher is None or prefetcher.variant != profile:
+        if prefetcher is not None:
+            # Extractions made with the previous profile are no longer needed
+            prefetcher.sync([])
+        prefetcher = UploadPrefetcher(get_extraction_cache(), MoMGenerator(api_key, config).iter_text_segments, variant=profile)
+        st.session_state["prefetcher"] = prefetcher
+    prefetch_keys = prefetcher.sync(uploaded_files or [])
+    if prefetch_keys:
+        ready = sum(prefetcher.is_ready(key) for key in prefetch_keys)
+        st.caption(f"Text extracted from {ready} of {len(prefetch_keys)} files")
 
     if uploaded_files and st.button("🔄 Generate MoM"):
-        combined_text = ""
-        for file in uploaded_files:
-            combined_text += f"\n\n--- {file.name} ---\n" + mom_gen.extract_text_from_file(file)
-        mom_data = mom_gen.process_text_with_gemini(combined_text)
-        st.json(mom_data)
-        excel_buffer = mom_gen.create_excel_file(mom_data)
-        st.download_button("📥 Download Excel", excel_buffer.getvalue(), file_name=f"MoM_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+        job_id = job_queue.submit(EXCEL_MOM_JOB, {"prefetch_keys": prefetch_keys, "profile": profile}, uploaded_files, secrets={"api_key": api_key})
+        # Keep the job ID in the URL too, so a browser refresh can pick it up again
+        st.session_state["job_id"] = job_id
+        st.query_params["job"] = job_id
+
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    if job_id:
+        show_job(job_queue, job_id)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,7 +1,13 @@
 import streamlit as st 
 #from text_extraction import extract_text_from_file
 from generate_mom import generate_minutes_of_meeting, extract_text_from_image
-from formatting import generate_mom_html
+from formatting import generate_mom_html, generate_word_file
+from mom_jobs import get_job_queue, iter_word_mom_segments, WORD_MOM_JOB
+from prefetch import UploadPrefetcher, get_extraction_cache
+from config import Config, PERFORMANCE_PROFILES
+from functools import partial
+from job_queue import JOB_DONE, JOB_FAILED, JOB_CANCELLED
+import time
 from PIL import Image
 import pandas as pd
 import io
@@ -31,74 +37,47 @@ if uploaded_file:
     if file_type.startswith("image/"):
         image = Image.open(uploaded_file)
         st.image(image, caption="Uploaded Handwritten Notes", use_container_width=True)
-        
-        # Save temp image file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-            image.save(tmp.name)
-            img_path = tmp.name
 
-        with st.spinner("🔍 Extracting content from handwritten image..."):
-            raw_text = extract_text_from_image(img_path)
+profile = st.sidebar.selectbox("Performance profile", list(PERFORMANCE_PROFILES),
+                               index=list(PERFORMANCE_PROFILES).index(Config.PERFORMANCE_PROFILE))
+
+# Extraction starts in the background as soon as a file is uploaded, so the
+# Generate click only waits for whatever is left of it plus the Gemini call
+prefetcher = st.session_state.get("prefetcher")
+if prefetcher is None or prefetcher.variant != profile:
+    if prefetcher is not None:
+        prefetcher.sync([])
+    prefetcher = UploadPrefetcher(get_extraction_cache(),
+                                  partial(iter_word_mom_segments, config=Config(profile)), variant=profile)
+    st.session_state["prefetcher"] = prefetcher
+prefetch_keys = prefetcher.sync([uploaded_file] if uploaded_file else [])
+
+if prefetch_keys:
+    if prefetcher.is_ready(prefetch_keys[0]):
+        segments = get_extraction_cache().segments(prefetch_keys[0]) or []
         st.subheader("📄 :orange[Extracted Text]")
-        st.text_area("Raw Text", raw_text, height=300)
-        
-def generate_word_file(response_text: str) -> io.BytesIO:
-    
-    """
-     Converts the AI response text (which includes a table and a summary section)
-    into a formatted Word document.
-    """
-    doc = Document()
-
-    # Title
-    title = doc.add_heading("Minutes of Meeting", level=0)
-    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-
-    lines = response_text.strip().split('\n')
-    table_started = False
-    summary_started = False
-
-    table = None
-
-    for line in lines:
-        line = line.strip()
-
-        if line.lower().startswith("date:"):
-            doc.add_paragraph(line)
-
-        elif "|" in line and not summary_started:
-            parts = [cell.strip() for cell in line.strip('|').split('|')]
-            if not table_started:
-                table = doc.add_table(rows=1, cols=len(parts))
-                table.style = "Table Grid"
-                hdr_cells = table.rows[0].cells
-                for i, part in enumerate(parts):
-                    hdr_cells[i].text = part
-                table_started = True
-            else:
-                row_cells = table.add_row().cells
-                for i, part in enumerate(parts):
-                    row_cells[i].text = part
-
-        elif "Summary & Key Action Items" in line:
-            doc.add_paragraph()
-            doc.add_heading("Summary & Key Action Items", level=1)
-            summary_started = True
-
-        elif summary_started:
-            if line:
-                para = doc.add_paragraph(line)
-                para.style.font.size = Pt(11)
-
-    # Save to buffer
-    word_io = io.BytesIO()
-    doc.save(word_io)
-    word_io.seek(0)
-    return word_io
-
-if st.button("🧠 Generate MoM using AI"):
-    with st.spinner("⏳ AI is Working..."):
-        formatted_mom = generate_minutes_of_meeting(raw_text)
+        st.text_area("Raw Text", "".join(segment.text for segment in segments), height=300)
+    else:
+        st.caption("🔍 Extracting content in the background...")
+
+# Extraction, generation and export run on the background job queue, so widget
+# changes and browser refreshes do not cancel an in-flight Gemini call
+job_queue = get_job_queue()
+
+if uploaded_file and st.button("🧠 Generate MoM using AI"):
+    job_id = job_queue.submit(WORD_MOM_JOB, {"prefetch_keys": prefetch_keys, "profile": profile}, [uploaded_file])
+    st.session_state["job_id"] = job_id
+    st.query_params["job"] = job_id
+
+job_id = st.session_state.get("job_id") or st.query_params.get("job")
+job = job_queue.get(job_id) if job_id else None
+
+if job is not None:
+    if job["status"] == JOB_DONE:
+        if not prefetch_keys:
+            st.subheader("📄 :orange[Extracted Text]")
+            st.text_area("Raw Text", job["result"]["raw_text"], height=300)
+        st.write(job["result"]["mom_text"])
             #st.subheader("✅ Structured Minutes of Meeting")
             #st.code(formatted_mom)
             #st.write(formatted_mom)
@@ -113,7 +92,17 @@ if st.button("🧠 Generate MoM using AI"):
             #pdf_file.seek(0)
 
             # Download PDF
-        docx_file = generate_word_file(formatted_mom)
-        st.download_button(label="📄📥 Download Word File (.docx)",data=docx_file,
-                file_name="Minutes_of_Meeting.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
\ No newline at end of file
+        with open(job["result"]["exports"]["docx"], "rb") as docx_file:
+            st.download_button(label="📄📥 Download Word File (.docx)",data=docx_file.read(),
+                    file_name="Minutes_of_Meeting.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+    elif job["status"] == JOB_FAILED:
+        st.error(f"Generation failed: {job['error']}")
+    elif job["status"] == JOB_CANCELLED:
+        st.info("Generation cancelled")
+    else:
+        st.progress(job["progress"], text=job["message"] or "⏳ AI is Working...")
+        if st.button("✖ Cancel"):
+            job_queue.cancel(job_id)
+        time.sleep(1)
+        st.rerun()
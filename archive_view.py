@@ -0,0 +1,45 @@
+# Streamlit view over the MoM archive
+# Filters archived action items by project, team, due date and free text
+
+import streamlit as st
+import pandas as pd
+from datetime import date
+
+from mom_archive import MoMArchive, POINT_OPEN, POINT_CLOSED, POINT_CARRIED, POINT_INFO
+
+ARCHIVE_COLUMNS = ['project_name', 'meeting_date_iso', 'sl_no', 'topic_head', 'discussion_decision',
+                   'responsible_team', 'target_date', 'status']
+
+
+def render_archive_view(archive: MoMArchive) -> None:
+    """Render archive filters and the matching discussion points"""
+    st.subheader("🗂️ MoM Archive")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        project = st.selectbox("Project", ["All"] + archive.list_projects())
+        team = st.text_input("Responsible team (prefix)")
+        text = st.text_input("Search topic / decision")
+    with col2:
+        status = st.selectbox("Status", ["All", POINT_OPEN, POINT_CLOSED, POINT_CARRIED, POINT_INFO])
+        filter_due = st.checkbox("Filter by target date")
+        today = date.today()
+        due_range = st.date_input("Target date range", (today.replace(day=1), today),
+                                  disabled=not filter_due)
+
+    due_from = due_to = None
+    if filter_due and isinstance(due_range, (tuple, list)) and len(due_range) == 2:
+        due_from, due_to = (d.isoformat() for d in due_range)
+
+    points = archive.query_points(
+        team=team or None,
+        project=None if project == "All" else project,
+        due_from=due_from,
+        due_to=due_to,
+        text=text or None,
+        status=None if status == "All" else status,
+    )
+
+    st.caption(f"{len(points)} matching discussion points")
+    if points:
+        st.dataframe(pd.DataFrame(points)[ARCHIVE_COLUMNS], use_container_width=True, hide_index=True)
@@ -0,0 +1,264 @@
+# Offline benchmark for MoM Generator
+# Measures prompt/response sizes and local post-processing latency without calling Gemini
+
+import argparse
+import copy
+import io
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from config import Config, PERFORMANCE_PROFILES, PromptTemplates
+from mom_model import MinutesOfMeeting
+from normalization import MoMNormalizer, normalize_table_model
+from text_pipeline import TextSegment, chunk_segments
+from uploads import Upload
+
+# Rough English/JSON average for Gemini tokenizers; good enough to compare variants
+CHARS_PER_TOKEN = 4
+
+_TEAMS = ['Waterproofing Team', 'Civil Contractor', 'MEP Consultant', 'Electrical Vendor', '']
+_FLOORS = ['6 flr', 'upto 10th', 'GF', 'B2', 'terrace', 'floor 3 zone b']
+_STATUS = ['90 %', 'done', 'wip', 'yet to start', '']
+_DATES = ['30/5/25', '2025-06-12', '3rd June 2025', 'TBD', '']
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text"""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Mean wall time of fn in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def synthetic_slim_response(points: int, rng: random.Random) -> Dict[str, Any]:
+    """Model output as requested by the slim prompt: raw values, unknown fields omitted"""
+    discussion_points = []
+    for i in range(points):
+        point = {
+            'topic_head': f"Shaft wall dismantling {i}",
+            'discussion_decision': f"Dismantle shaft wall at {rng.choice(_FLOORS)}, material indent to be raised",
+        }
+        if rng.random() < 0.7:
+            point['responsible_team'] = rng.choice(_TEAMS[:-1])
+        date = rng.choice(_DATES)
+        if date:
+            point['target_date'] = date
+        discussion_points.append(point)
+    return {
+        'meeting_header': {'project_name': 'Tower B', 'meeting_date': '2nd June 2025', 'venue': 'Site office'},
+        'participants': [{'consultant_organization': 'ABC Infra', 'participant_name': f"Engineer {i}"}
+                         for i in range(6)],
+        'discussion_points': discussion_points,
+        'additional_info': {},
+    }
+
+
+def full_response(slim: Dict[str, Any]) -> Dict[str, Any]:
+    """The same minutes as the full prompt asks the model to write them (normalized, all fields)"""
+    full = {
+        'meeting_header': dict.fromkeys(['project_name', 'meeting_subject', 'meeting_date', 'meeting_time',
+                                         'venue', 'mom_number', 'minutes_by']),
+        'participants': copy.deepcopy(slim['participants']),
+        'discussion_points': copy.deepcopy(slim['discussion_points']),
+        'additional_info': {'distribution_list': None, 'attachments': None,
+                            'next_meeting': {'date': None, 'venue': None}, 'response_deadline': None},
+    }
+    full['meeting_header'].update(slim['meeting_header'])
+    return MoMNormalizer().normalize_model(MinutesOfMeeting.from_dict(full)).to_dict()
+
+
+def synthetic_table(rows: int, rng: random.Random) -> str:
+    """Markdown MoM table with un-normalized cells"""
+    lines = [
+        "| Work Area | Sub-Activity/Component | Floor/Zone/Section | Description / Remarks | "
+        "Assigned To (if any) | Deadline (DD/MM/YYYY) | Status / Completion % |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for i in range(rows):
+        lines.append(f"| Civil | Store completion {i} | {rng.choice(_FLOORS)} | Pending material | "
+                     f"{rng.choice(_TEAMS)} | {rng.choice(_DATES)} | {rng.choice(_STATUS)} |")
+    return "\n".join(lines)
+
+
+def synthetic_line(i: int, rng: random.Random) -> str:
+    """One line of meeting notes"""
+    return (f"{i + 1}. Shaft wall dismantling at {rng.choice(_FLOORS)}, "
+            f"{rng.choice(_TEAMS) or 'site team'} to complete by {rng.choice(_DATES) or 'TBD'}")
+
+
+def synthetic_page_image(rng: random.Random) -> bytes:
+    """PNG of an A4 page of typed notes scanned at 300 dpi"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new('L', (2480, 3508), 255)
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=36)
+    except TypeError:  # Pillow < 10.1 has a single bitmap font size
+        font = ImageFont.load_default()
+    for i in range(60):
+        draw.text((150, 150 + i * 52), synthetic_line(i, rng), fill=0, font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def synthetic_pdf(pages: int, rng: random.Random) -> bytes:
+    """Text PDF of meeting notes"""
+    import fitz
+
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        for i in range(45):
+            page.insert_text((56, 56 + i * 16), synthetic_line(i, rng), fontsize=10)
+    return doc.tobytes()
+
+
+def measure_optional(name: str, setup: Callable[[], Callable[[], Any]], repeat: int) -> List[Any]:
+    """Time the function returned by setup, or report why it cannot run here"""
+    try:
+        return [name, f"{timed(setup(), repeat):.1f} ms"]
+    except ImportError as e:
+        return [name, f"skipped ({e.name} not installed)"]
+    except Exception as e:  # e.g. no tesseract binary on this host
+        return [name, f"skipped ({type(e).__name__}: {e})"[:100]]
+
+
+def bench_prompts() -> List[List[Any]]:
+    """Input tokens spent on instructions by each prompt variant"""
+    rows = [
+        ['PromptTemplates.MAIN_PROMPT', estimate_tokens(PromptTemplates.MAIN_PROMPT)],
+        ['PromptTemplates.SLIM_PROMPT', estimate_tokens(PromptTemplates.SLIM_PROMPT)],
+    ]
+    try:
+        from generate_mom import MOM_PROMPT, MOM_PROMPT_SLIM
+        rows.append(['generate_mom.MOM_PROMPT', estimate_tokens(MOM_PROMPT)])
+        rows.append(['generate_mom.MOM_PROMPT_SLIM', estimate_tokens(MOM_PROMPT_SLIM)])
+    except ImportError as e:
+        rows.append(['generate_mom prompts', f"skipped ({e.name} not installed)"])
+    return rows
+
+
+def bench_output(points: int, rng: random.Random) -> List[List[Any]]:
+    """Output tokens for the same minutes written fully by the model vs. left to normalization"""
+    slim = synthetic_slim_response(points, rng)
+    return [
+        ['full-format JSON response', estimate_tokens(json.dumps(full_response(slim), indent=2))],
+        ['slim JSON response', estimate_tokens(json.dumps(slim, indent=2))],
+    ]
+
+
+def bench_normalization(points: int, repeat: int, rng: random.Random) -> List[List[Any]]:
+    """Latency of the local normalization stage"""
+    normalizer = MoMNormalizer()
+    slim = synthetic_slim_response(points, rng)
+    table = synthetic_table(points, rng)
+    return [
+        [f"MinutesOfMeeting.from_dict + normalize_model ({points} points)",
+         f"{timed(lambda: normalizer.normalize_model(MinutesOfMeeting.from_dict(slim)), repeat):.3f} ms"],
+        [f"MinutesOfMeeting.from_markdown + normalize_table_model ({points} rows)",
+         f"{timed(lambda: normalize_table_model(MinutesOfMeeting.from_markdown(table)), repeat):.3f} ms"],
+    ]
+
+
+def bench_profile(name: str, repeat: int, rng: random.Random) -> List[List[Any]]:
+    """Local latency of the extraction stages as configured by a performance profile"""
+    config = Config(name)
+    page_png = synthetic_page_image(rng) if _has_module('PIL') else b''
+    slow_repeat = max(1, min(repeat, 3))
+
+    def setup_preprocess():
+        from PIL import Image
+        from resource_manager import get_resource_manager
+
+        ocr_engine = get_resource_manager().get_ocr_engine(config)
+        preprocess = ocr_engine.preprocessor()
+        image = Image.open(io.BytesIO(page_png))
+        image.load()
+
+        def run():
+            frame = ocr_engine._fit_resolution(image)
+            return preprocess(frame) if preprocess else frame
+        return run
+
+    def setup_ocr():
+        from generator import iter_file_segments
+        from resource_manager import get_resource_manager
+
+        # Engines are created and warmed up here, outside the timed calls
+        get_resource_manager().get_ocr_engine(config)
+        return lambda: list(iter_file_segments(
+            Upload(io.BytesIO(page_png), name='page.png', type='image/png'), config))
+
+    def setup_pdf():
+        from resource_manager import PDFEngine
+
+        pdf = synthetic_pdf(20, rng)
+        engine = PDFEngine(config.PDF_ENGINE or 'pypdf2')
+        return lambda: engine.extract_pages(Upload(io.BytesIO(pdf), name='minutes.pdf', type='application/pdf'))
+
+    segments = [TextSegment('notes.txt', page, "\n".join(synthetic_line(i, rng) for i in range(45)))
+                for page in range(1, 201)]
+    chunking = timed(lambda: list(chunk_segments(segments, config.EXTRACTION_CHUNK_CHARS)), repeat)
+    return [
+        ['model tier (not timed offline)', config.GEMINI_MODEL],
+        ['OCR settings', f"{config.TESSERACT_CONFIG} | preprocess={config.OCR_PREPROCESS} | "
+                         f"long side {config.OCR_MIN_LONG_SIDE_PX or '-'}..{config.OCR_MAX_LONG_SIDE_PX or '-'} px"],
+        measure_optional("image resize + preprocess (A4 @ 300 dpi)", setup_preprocess, repeat),
+        measure_optional("image OCR (A4 @ 300 dpi)", setup_ocr, slow_repeat),
+        measure_optional(f"PDF text, 20 pages ({config.PDF_ENGINE or 'pypdf2'})", setup_pdf, slow_repeat),
+        [f"chunking 200 pages (chunk size {config.EXTRACTION_CHUNK_CHARS:,})", f"{chunking:.3f} ms"],
+        ['workers (jobs / prefetch / OCR tiles)',
+         f"{config.JOB_WORKERS} / {config.PREFETCH_WORKERS} / {config.OCR_TILE_WORKERS}"],
+        ['cache (prefetch entries / LLM clients / idle TTL)',
+         f"{config.PREFETCH_MAX_ENTRIES} / {config.MAX_CACHED_CLIENTS} / {config.RESOURCE_IDLE_TTL_SECONDS}s"],
+    ]
+
+
+def _has_module(name: str) -> bool:
+    """True if a module can be imported"""
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def print_table(title: str, rows: List[List[Any]]) -> None:
+    """Print a two-column result table"""
+    print(f"\n{title}")
+    width = max(len(str(row[0])) for row in rows)
+    for name, value in rows:
+        print(f"  {str(name):<{width}}  {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline MoM Generator benchmark")
+    parser.add_argument('--points', type=int, default=40, help="discussion points per synthetic meeting")
+    parser.add_argument('--repeat', type=int, default=200, help="repetitions for latency measurements")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--profile', choices=list(PERFORMANCE_PROFILES) + ['all'], default='all',
+                        help="performance profile(s) to measure")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Token counts are estimates ({CHARS_PER_TOKEN} chars/token); slim prompts enabled: "
+          f"{Config.USE_SLIM_PROMPTS}")
+    print_table("Prompt instruction tokens (per request)", bench_prompts())
+    print_table(f"Response tokens ({args.points} discussion points)", bench_output(args.points, rng))
+    print_table("Local normalization latency", bench_normalization(args.points, args.repeat, rng))
+    profiles = list(PERFORMANCE_PROFILES) if args.profile == 'all' else [args.profile]
+    for name in profiles:
+        print_table(f"Profile '{name}'", bench_profile(name, args.repeat, rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# Carry-forward module for MoM Generator
+# Matches new discussion points against open items of earlier meetings using TF-IDF
+
+import re
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from config import Config
+from mom_archive import MoMArchive, POINT_OPEN, POINT_CLOSED, POINT_CARRIED
+from mom_model import DiscussionPoint, MinutesOfMeeting
+from normalization import parse_date
+
+CARRIED_FORWARD = 'carried_forward'
+NEW_ITEM = 'new'
+CLOSED_ITEM = 'closed'
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or the to was were will with "
+    "shall should be been being this that these those done do".split()
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and single characters"""
+    return [tok for tok in _TOKEN.findall(text.lower()) if len(tok) > 1 and tok not in _STOPWORDS]
+
+
+def _point_text(point: Union[DiscussionPoint, Dict[str, Any]]) -> str:
+    """Text used to compare two discussion points"""
+    if isinstance(point, DiscussionPoint):
+        return f"{point.topic_head} {point.discussion_decision}"
+    return f"{point.get('topic_head', '')} {point.get('discussion_decision', '')}"
+
+
+class CarryForwardMatcher:
+    """Local TF-IDF/cosine matcher between new and previously open discussion points"""
+
+    def __init__(self, threshold: Optional[float] = None, config: Optional[Config] = None):
+        """Initialize matcher with a minimum cosine similarity for a carry-forward"""
+        self.config = config or Config()
+        self.threshold = threshold if threshold is not None else self.config.CARRY_FORWARD_THRESHOLD
+
+    def similarity_matrix(self, new_texts: List[str], previous_texts: List[str]) -> np.ndarray:
+        """Cosine similarity of TF-IDF vectors, shape (len(new_texts), len(previous_texts))"""
+        n_new, n_prev = len(new_texts), len(previous_texts)
+        if n_new == 0 or n_prev == 0:
+            return np.zeros((n_new, n_prev), dtype=np.float32)
+
+        # Flatten the corpus into (document, term) pairs
+        vocab: Dict[str, int] = {}
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        for doc, text in enumerate(new_texts + previous_texts):
+            tokens = _tokenize(text)
+            doc_ids.extend([doc] * len(tokens))
+            term_ids.extend(vocab.setdefault(tok, len(vocab)) for tok in tokens)
+        if not term_ids:
+            return np.zeros((n_new, n_prev), dtype=np.float32)
+
+        n_docs, n_terms = n_new + n_prev, len(vocab)
+        pairs, counts = np.unique(
+            np.asarray(doc_ids, dtype=np.int64) * n_terms + np.asarray(term_ids, dtype=np.int64),
+            return_counts=True
+        )
+        docs, terms = pairs // n_terms, pairs % n_terms
+
+        # Sublinear TF, smoothed IDF, L2-normalized rows
+        df = np.bincount(terms, minlength=n_terms)
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        weights = (1.0 + np.log(counts)) * idf[terms]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=n_docs))
+        weights /= np.where(norms[docs] > 0, norms[docs], 1.0)
+
+        # Only terms present in the new points can contribute to a dot product,
+        # so the dense matrices are restricted to that (small) vocabulary
+        is_new = docs < n_new
+        query_terms = np.unique(terms[is_new])
+        column = np.full(n_terms, -1, dtype=np.int64)
+        column[query_terms] = np.arange(len(query_terms))
+
+        new_matrix = np.zeros((n_new, len(query_terms)), dtype=np.float32)
+        new_matrix[docs[is_new], column[terms[is_new]]] = weights[is_new]
+
+        shared = ~is_new & (column[terms] >= 0)
+        prev_matrix = np.zeros((n_prev, len(query_terms)), dtype=np.float32)
+        prev_matrix[docs[shared] - n_new, column[terms[shared]]] = weights[shared]
+
+        return new_matrix @ prev_matrix.T
+
+    def match(self, new_points: List[Union[DiscussionPoint, Dict[str, Any]]],
+              previous_points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Annotate new points as carried-forward or new and list previous points now closed
+
+        Each new point gets 'carry_forward' (CARRIED_FORWARD or NEW_ITEM), plus
+        'previous_point_id' and 'similarity' when carried forward. Previous points
+        must carry their archive 'id'. Returns the annotated points, the IDs of
+        carried-forward previous points and the IDs of closed ones.
+        """
+        similarity = self.similarity_matrix([_point_text(p) for p in new_points],
+                                            [_point_text(p) for p in previous_points])
+
+        # Greedy one-to-one assignment, best pairs first
+        rows, cols = np.nonzero(similarity >= self.threshold)
+        order = np.argsort(-similarity[rows, cols], kind='stable')
+        assigned_new: Dict[int, int] = {}
+        used_prev = set()
+        for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+            if row in assigned_new or col in used_prev:
+                continue
+            assigned_new[row] = col
+            used_prev.add(col)
+
+        annotated = []
+        for i, point in enumerate(new_points):
+            point = point.to_dict() if isinstance(point, DiscussionPoint) else dict(point)
+            if i in assigned_new:
+                previous = previous_points[assigned_new[i]]
+                point['carry_forward'] = CARRIED_FORWARD
+                point['previous_point_id'] = previous.get('id')
+                point['similarity'] = round(float(similarity[i, assigned_new[i]]), 3)
+            else:
+                point['carry_forward'] = NEW_ITEM
+            annotated.append(point)
+
+        return {
+            'discussion_points': annotated,
+            'carried_ids': [previous_points[j].get('id') for j in sorted(used_prev)],
+            'closed_ids': [p.get('id') for j, p in enumerate(previous_points) if j not in used_prev],
+        }
+
+
+def apply_carry_forward(archive: MoMArchive, mom: MinutesOfMeeting,
+                        matcher: Optional[CarryForwardMatcher] = None) -> MinutesOfMeeting:
+    """Match a new MoM against the project's open items of earlier meetings and update their status
+
+    Only meetings dated before this one are considered (all of them when its
+    date is unknown), never an archived copy of this MoM itself. When the MoM
+    replaces an archived copy, the statuses that copy's run set are undone
+    first, so a regenerated MoM matches the same items again. Annotates the
+    discussion points of mom in place and returns it; must be called before
+    the new MoM itself is archived.
+    """
+    matcher = matcher or CarryForwardMatcher()
+    project = mom.meeting_header.project_name
+    source = archive.meeting_key(mom)
+    if not project or project == matcher.config.DEFAULT_VALUES['not_specified']:
+        previous_points = []
+    else:
+        if source is not None:
+            archive.reopen_points(source)
+        meeting_date = parse_date(mom.meeting_header.meeting_date)
+        meeting_to = (meeting_date - timedelta(days=1)).isoformat() if meeting_date else None
+        own_id = archive.find_meeting(mom)
+        previous_points = [
+            p for p in archive.query_points(project=project, status=POINT_OPEN, meeting_to=meeting_to,
+                                            limit=matcher.config.CARRY_FORWARD_MAX_HISTORY)
+            if p['meeting_id'] != own_id
+        ]
+
+    points = mom.discussion_points
+    result = matcher.match(points, previous_points)
+    archive.set_point_status(result['carried_ids'], POINT_CARRIED, source)
+    archive.set_point_status(result['closed_ids'], POINT_CLOSED, source)
+
+    for point, annotated in zip(points, result['discussion_points']):
+        point.carry_forward = annotated['carry_forward']
+        point.previous_point_id = annotated.get('previous_point_id')
+        point.similarity = annotated.get('similarity')
+    mom.carry_forward_summary = {
+        CARRIED_FORWARD: len(result['carried_ids']),
+        NEW_ITEM: len(points) - len(result['carried_ids']),
+        CLOSED_ITEM: len(result['closed_ids']),
+    }
+    return mom
@@ -0,0 +1,56 @@
+# Command-line module for MoM Generator
+# Generates a MoM from files without the web UI, e.g. python cli.py --profile fast notes.pdf
+
+import argparse
+import mimetypes
+import shutil
+import sys
+import time
+
+from config import Config, PERFORMANCE_PROFILES
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate Minutes of Meeting from files")
+    parser.add_argument('files', nargs='+', help="meeting files (txt, pdf, docx or images)")
+    parser.add_argument('--profile', choices=list(PERFORMANCE_PROFILES), default=Config.PERFORMANCE_PROFILE,
+                        help="performance profile (default: MOM_PROFILE or 'balanced')")
+    parser.add_argument('--format', choices=['xlsx', 'docx'], default='xlsx',
+                        help="xlsx: JSON MoM exported to Excel; docx: tabular MoM exported to Word")
+    parser.add_argument('--output', '-o', help="output file (default: MoM.<format>)")
+    parser.add_argument('--api-key', default=Config.get_gemini_api_key(),
+                        help="Gemini API key (default: GOOGLE_API_KEY)")
+    args = parser.parse_args()
+
+    # Process-wide worker pools and caches are sized by the selected profile too,
+    # so it must be set before the job queue and resource manager are created
+    Config.PERFORMANCE_PROFILE = args.profile
+
+    from job_queue import JOB_DONE, FINISHED_STATES
+    from mom_jobs import EXCEL_MOM_JOB, WORD_MOM_JOB, get_job_queue
+    from uploads import Upload
+
+    uploads = [Upload(path, type=mimetypes.guess_type(path)[0] or '') for path in args.files]
+    kind = EXCEL_MOM_JOB if args.format == 'xlsx' else WORD_MOM_JOB
+    queue = get_job_queue()
+    job_id = queue.submit(kind, {'profile': args.profile}, uploads, secrets={'api_key': args.api_key})
+
+    start = time.perf_counter()
+    job = queue.get(job_id)
+    while job['status'] not in FINISHED_STATES:
+        print(f"\r[{time.perf_counter() - start:6.1f}s] {job['message'] or 'Queued'}".ljust(60), end='', flush=True)
+        time.sleep(queue.config.JOB_POLL_INTERVAL_SECONDS)
+        job = queue.get(job_id)
+    print()
+
+    if job['status'] != JOB_DONE:
+        print(f"Generation {job['status']}: {job['error'] or ''}", file=sys.stderr)
+        return 1
+    output = args.output or f"MoM.{args.format}"
+    shutil.copyfile(job['result']['exports'][args.format], output)
+    print(f"Wrote {output} in {time.perf_counter() - start:.1f}s (profile: {args.profile})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
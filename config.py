@@ -3,24 +3,133 @@
 # Contains all configuration settings and constants
 
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Performance profiles: settings that trade speed for quality, switched together.
+# 'balanced' is the class defaults below; the others override them
+PERFORMANCE_PROFILES: Dict[str, Dict[str, Any]] = {
+    'fast': {
+        # OCR: LSTM only, single text block, no inverted-text pass, no enhancement
+        'TESSERACT_CONFIG': r'--oem 1 --psm 6 -c tessedit_do_invert=0',
+        'OCR_PREPROCESS': False,
+        'OCR_MAX_LONG_SIDE_PX': 2500,
+        'OCR_MIN_LONG_SIDE_PX': None,
+        'PDF_ENGINE': 'pymupdf',
+        'GEMINI_MODEL': 'gemini-2.0-flash-lite',
+        'EXTRACTION_CHUNK_CHARS': 50000,
+        'OCR_TILE_WORKERS': 8,
+        'JOB_WORKERS': 4,
+        'PREFETCH_WORKERS': 4,
+        'PREFETCH_MAX_ENTRIES': 128,
+        'MAX_CACHED_CLIENTS': 16,
+        'RESOURCE_IDLE_TTL_SECONDS': 4 * 3600,
+    },
+    'balanced': {},
+    'accurate': {
+        # OCR: full page layout analysis on enhanced, upscaled images
+        'TESSERACT_CONFIG': r'--oem 1 --psm 3',
+        'OCR_PREPROCESS': True,
+        'OCR_CONTRAST': 1.5,
+        'OCR_SHARPNESS': 1.5,
+        'OCR_MAX_LONG_SIDE_PX': None,
+        'OCR_MIN_LONG_SIDE_PX': 2000,
+        'PDF_ENGINE': 'pdfplumber',
+        'GEMINI_MODEL': 'gemini-2.5-pro',
+        'EXTRACTION_CHUNK_CHARS': 10000,
+        'OCR_TILE_WORKERS': 2,
+        'JOB_WORKERS': 1,
+        'PREFETCH_WORKERS': 1,
+        'PREFETCH_MAX_ENTRIES': 32,
+        'MAX_CACHED_CLIENTS': 4,
+        'RESOURCE_IDLE_TTL_SECONDS': 1800,
+    },
+}
+
+# Used when TESSERACT_CMD is not set and tesseract is not on PATH (Windows installer default)
+WINDOWS_TESSERACT_PATH = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
 class Config:
     """Configuration class for MoM Generator"""
     
+    # Performance profile applied by Config() (see PERFORMANCE_PROFILES)
+    PERFORMANCE_PROFILE: str = os.getenv('MOM_PROFILE', 'balanced')
+    
     # File upload settings
     SUPPORTED_FILE_TYPES: List[str] = [
-        'txt', 'pdf', 'docx', 'png', 'jpg', 'jpeg', 'tiff', 'bmp'
+        'txt', 'pdf', 'docx', 'png', 'jpg', 'jpeg', 'tiff', 'tif', 'bmp'
     ]
     
     MAX_FILE_SIZE_MB: int = 200
     
-    # API settings
-    GEMINI_MODEL: str = "gemini-pro"
+    # Uploads above this size are spooled to disk and read through mmap
+    UPLOAD_SPOOL_THRESHOLD_MB: int = 16
+    UPLOAD_SPOOL_DIR: str = os.path.join(os.getenv('MOM_DATA_DIR', '.mom_data'), 'spool')
+    
+    # API settings (one model for every entry point; 'gemini-pro' is no longer served)
+    GEMINI_MODEL: str = "gemini-2.0-flash"
     GEMINI_TEMPERATURE: float = 0.1
     
+    # Slim prompts leave date/floor/status formatting, defaults and numbering
+    # to the local normalization stage (normalization.py)
+    USE_SLIM_PROMPTS: bool = os.getenv('MOM_SLIM_PROMPTS', '1') != '0'
+    
+    # Ask Gemini for JSON constrained to mom_model.MOM_RESPONSE_SCHEMA
+    USE_STRUCTURED_OUTPUT: bool = os.getenv('MOM_STRUCTURED_OUTPUT', '1') != '0'
+    
+    # Replace Gemini with stub_llm.StubChatModel (load tests, offline development)
+    LLM_STUB: bool = os.getenv('MOM_LLM_STUB', '0') != '0'
+    LLM_STUB_LATENCY_MS: int = int(os.getenv('MOM_LLM_STUB_LATENCY_MS', '200'))
+    
     # OCR settings
     TESSERACT_CONFIG: str = r'--oem 3 --psm 6'
+    OCR_PREPROCESS: bool = True
+    OCR_CONTRAST: float = 1.2
+    OCR_SHARPNESS: float = 1.1
+    # Frames are rescaled so their long side stays within these bounds (None = no limit)
+    OCR_MAX_LONG_SIDE_PX: Optional[int] = None
+    OCR_MIN_LONG_SIDE_PX: Optional[int] = None
+    OCR_MAX_IMAGE_PIXELS: int = 400_000_000
+    OCR_TILE_MAX_PIXELS: int = 16_000_000
+    OCR_TILE_OVERLAP_PX: int = 96
+    OCR_TILE_WORKERS: int = 4
+    
+    # PDF text backend: 'pymupdf', 'pdfplumber' or 'pypdf2'. None keeps each path's
+    # own backend: PyPDF2 for the Excel MoM, PyMuPDF for the Word MoM
+    PDF_ENGINE: Optional[str] = None
+    
+    # Resource cache settings (clients and engines reused across reruns)
+    RESOURCE_IDLE_TTL_SECONDS: int = 3600
+    MAX_CACHED_CLIENTS: int = 8
+    API_KEY_VALID_TTL_SECONDS: int = 6 * 3600
+    API_KEY_INVALID_TTL_SECONDS: int = 60
+    
+    # Background job settings
+    DATA_DIR: str = os.getenv('MOM_DATA_DIR', '.mom_data')
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_RETENTION_HOURS: int = 24
+    # Each process heartbeats its queue; jobs of a process silent for longer are failed
+    JOB_HEARTBEAT_SECONDS: float = 10.0
+    JOB_OWNER_TIMEOUT_SECONDS: float = 60.0
+    # Extracted text is joined back into one prompt; this only sets how often an
+    # Excel job reports progress and checks for cancellation during extraction
+    EXTRACTION_CHUNK_CHARS: int = 20000
+    
+    # Speculative extraction started as soon as files are uploaded
+    PREFETCH_WORKERS: int = 2
+    PREFETCH_MAX_ENTRIES: int = 64
+    # A session that stops rerunning (closed tab) keeps its extractions this long
+    PREFETCH_LEASE_SECONDS: int = 1800
+    
+    # HTTP service (service.py)
+    SERVICE_HOST: str = os.getenv('MOM_SERVICE_HOST', '127.0.0.1')
+    SERVICE_PORT: int = int(os.getenv('MOM_SERVICE_PORT', '8080'))
+    SERVICE_UPLOAD_TTL_SECONDS: int = 3600
+    SERVICE_MAX_WAIT_SECONDS: float = 60.0
+    
+    # Carry-forward matching of open action items between meetings
+    CARRY_FORWARD_THRESHOLD: float = 0.35
+    CARRY_FORWARD_MAX_HISTORY: int = 20000
     
     # Excel settings
     EXCEL_ENGINE: str = 'openpyxl'
@@ -42,6 +151,15 @@ class Config:
         'for_information': 'For Information'
     }
     
+    def __init__(self, profile: Optional[str] = None):
+        """Apply a performance profile (MOM_PROFILE by default) on top of the class defaults"""
+        profile = profile or self.PERFORMANCE_PROFILE
+        if profile not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Unknown performance profile: {profile}")
+        self.PERFORMANCE_PROFILE = profile
+        for name, value in PERFORMANCE_PROFILES[profile].items():
+            setattr(self, name, value)
+    
     @staticmethod
     def get_gemini_api_key() -> str:
         """Get Gemini API key from environment variables"""
@@ -49,8 +167,13 @@ class Config:
     
     @staticmethod
     def get_tesseract_path() -> str:
-        """Get Tesseract executable path"""
-        return os.getenv('TESSERACT_CMD', 'tesseract')
+        """Get Tesseract executable path (TESSERACT_CMD, the default Windows install, or PATH)"""
+        path = os.getenv('TESSERACT_CMD')
+        if path:
+            return path
+        if os.name == 'nt' and os.path.exists(WINDOWS_TESSERACT_PATH):
+            return WINDOWS_TESSERACT_PATH
+        return 'tesseract'
 
 class PromptTemplates:
     """Prompt templates for Gemini AI"""
@@ -115,7 +238,36 @@ class PromptTemplates:
     **INPUT TEXT TO ANALYZE:**
     """
     
+    # Same structure as MAIN_PROMPT; formatting rules are applied locally afterwards
+    SLIM_PROMPT = """
+    Extract the meeting minutes from the text below as JSON. Omit fields that are not in the text. Copy dates as written.
+    {"meeting_header": {"project_name", "meeting_subject", "meeting_date", "meeting_time", "venue", "mom_number", "minutes_by"},
+     "participants": [{"consultant_organization", "participant_name"}],
+     "discussion_points": [{"topic_head", "discussion_decision", "responsible_team", "target_date"}],
+     "additional_info": {"distribution_list", "attachments", "next_meeting": {"date", "venue"}, "response_deadline"}}
+    One discussion point per topic; state decisions and who is responsible.
+
+    TEXT:
+    """
+    
+    # The output shape is enforced by the response schema, so only the content is described
+    STRUCTURED_PROMPT = """
+    Extract the meeting minutes from the text below. Omit fields that are not in the text. Copy dates as written.
+    One discussion point per topic; state decisions and who is responsible. For site/construction notes also fill
+    work_area (Fire, Civil, Plumbing, Waterproofing, Electrical, Putty, Snowcem, ...), floor_zone and completion_status,
+    and give a short summary with action_items.
+
+    TEXT:
+    """
+    
+    @classmethod
+    def get_structured_prompt(cls, text: str) -> str:
+        """Get the prompt used together with the structured-output response schema"""
+        return cls.STRUCTURED_PROMPT + f"\n\n{text}"
+    
     @classmethod
-    def get_extraction_prompt(cls, text: str) -> str:
+    def get_extraction_prompt(cls, text: str, slim: bool = None) -> str:
         """Get complete prompt with input text"""
-        return cls.MAIN_PROMPT + f"\n\n{text}"
\ No newline at end of file
+        if slim is None:
+            slim = Config.USE_SLIM_PROMPTS
+        return (cls.SLIM_PROMPT if slim else cls.MAIN_PROMPT) + f"\n\n{text}"
\ No newline at end of file
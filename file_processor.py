@@ -1,90 +1,112 @@
 # File processing module for MoM Generator
 # Handles extraction of text from various file formats
 
-import pytesseract
 from PIL import Image
 import mammoth
-import PyPDF2
 import io
 import streamlit as st
-from typing import List, Union
+from typing import Iterator, List, Optional, Union
 from config import Config
+from resource_manager import get_resource_manager
+from text_pipeline import TextSegment
+from uploads import as_upload
 
 class FileProcessor:
     """Handles file processing and text extraction"""
     
-    def __init__(self):
-        """Initialize file processor with configuration"""
-        self.config = Config()
-        # Set tesseract path if specified
-        tesseract_path = self.config.get_tesseract_path()
-        if tesseract_path != 'tesseract':
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+    def __init__(self, config: Optional[Config] = None):
+        """Initialize file processor with a performance profile's configuration and engines"""
+        resources = get_resource_manager()
+        self.config = config or resources.config
+        # OCR and PDF engines are created and warmed once per process and profile
+        self.ocr_engine = resources.get_ocr_engine(self.config)
+        self.pdf_engine = resources.get_pdf_engine(self.config)
     
     def process_multiple_files(self, uploaded_files: List) -> str:
         """Process multiple uploaded files and combine text"""
-        combined_text = ""
+        parts = []
         
         for file in uploaded_files:
             try:
                 st.info(f"Processing: {file.name}")
                 text = self.extract_text_from_file(file)
                 if text.strip():
-                    combined_text += f"\n\n--- Content from {file.name} ---\n{text}"
+                    parts.append(f"\n\n--- Content from {file.name} ---\n{text}")
                 else:
                     st.warning(f"No text extracted from {file.name}")
             except Exception as e:
                 st.error(f"Error processing {file.name}: {str(e)}")
                 continue
         
-        return combined_text
+        return "".join(parts)
+    
+    def iter_text_segments(self, uploaded_file) -> Iterator[TextSegment]:
+        """Yield (source, page, text) segments of a file as each page is extracted"""
+        uploaded_file = as_upload(uploaded_file)
+        file_type = uploaded_file.type
+        
+        if file_type.startswith('image/'):
+            yield from self._iter_image_segments(uploaded_file)
+        elif file_type == 'application/pdf':
+            yield from self._iter_pdf_segments(uploaded_file)
+        elif file_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
+            yield TextSegment(uploaded_file.name, 1, self._extract_from_docx(uploaded_file))
+        elif file_type == 'text/plain':
+            yield TextSegment(uploaded_file.name, 1, str(uploaded_file.buffer(), "utf-8"))
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
     
     def extract_text_from_file(self, uploaded_file) -> str:
         """Extract text from various file formats"""
-        file_type = uploaded_file.type
+        uploaded_file = as_upload(uploaded_file)
         
         try:
-            if file_type.startswith('image/'):
-                return self._extract_from_image(uploaded_file)
-            elif file_type == 'application/pdf':
+            if uploaded_file.type == 'application/pdf':
                 return self._extract_from_pdf(uploaded_file)
-            elif file_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-                return self._extract_from_docx(uploaded_file)
-            elif file_type == 'text/plain':
-                return str(uploaded_file.read(), "utf-8")
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
+            return "".join(segment.text for segment in self.iter_text_segments(uploaded_file))
         except Exception as e:
             st.error(f"Error extracting text from file: {str(e)}")
             return ""
     
-    def _extract_from_image(self, uploaded_file) -> str:
-        """Extract text from image using OCR"""
+    def _iter_image_segments(self, uploaded_file) -> Iterator[TextSegment]:
+        """Yield OCR text of each frame of an image (multi-page TIFFs yield several)"""
         try:
             image = Image.open(uploaded_file)
-            # Enhance image for better OCR
-            image = self._preprocess_image(image)
-            text = pytesseract.image_to_string(image, config=self.config.TESSERACT_CONFIG)
-            return text
+            # Each frame (or tile of a huge frame) is enhanced for better OCR
+            frames = self.ocr_engine.iter_frames_text(
+                image, config=self.config.TESSERACT_CONFIG,
+                preprocess=self.ocr_engine.preprocessor()
+            )
+            for frame_num, text in frames:
+                yield TextSegment(uploaded_file.name, frame_num, text)
         except Exception as e:
             raise Exception(f"OCR processing failed: {str(e)}")
     
+    def _iter_pdf_segments(self, uploaded_file) -> Iterator[TextSegment]:
+        """Yield the text of each PDF page as it is read"""
+        pages = self.pdf_engine.iter_pages(uploaded_file)
+        page_num = 0
+        while True:
+            try:
+                page_text = next(pages)
+            except StopIteration:
+                return
+            except Exception as e:
+                raise Exception(f"PDF processing failed: {str(e)}")
+            page_num += 1
+            yield TextSegment(uploaded_file.name, page_num, page_text)
+    
+    def _extract_from_image(self, uploaded_file) -> str:
+        """Extract text from image using OCR"""
+        return "\n".join(segment.text for segment in self._iter_image_segments(uploaded_file))
+    
     def _extract_from_pdf(self, uploaded_file) -> str:
         """Extract text from PDF"""
-        try:
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            text = ""
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text.strip():
-                        text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-                except Exception as e:
-                    st.warning(f"Could not extract text from page {page_num + 1}: {str(e)}")
-                    continue
-            return text
-        except Exception as e:
-            raise Exception(f"PDF processing failed: {str(e)}")
+        return "".join(
+            f"\n--- Page {segment.page} ---\n{segment.text}"
+            for segment in self._iter_pdf_segments(uploaded_file)
+            if segment.text.strip()
+        )
     
     def _extract_from_docx(self, uploaded_file) -> str:
         """Extract text from DOCX"""
@@ -100,36 +122,26 @@ class FileProcessor:
     def _preprocess_image(self, image: Image.Image) -> Image.Image:
         """Preprocess image for better OCR results"""
         try:
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Enhance contrast and brightness for better OCR
-            from PIL import ImageEnhance
-            
-            # Enhance contrast
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(1.2)
-            
-            # Enhance sharpness
-            enhancer = ImageEnhance.Sharpness(image)
-            image = enhancer.enhance(1.1)
-            
-            return image
+            return self.ocr_engine.enhance(image)
         except Exception:
             # Return original image if preprocessing fails
             return image
     
     def validate_file(self, uploaded_file) -> bool:
-        """Validate uploaded file"""
+        """Validate uploaded file without copying its content"""
+        upload = as_upload(uploaded_file)
+        
         # Check file type
-        file_extension = uploaded_file.name.split('.')[-1].lower()
+        file_extension = upload.extension
         if file_extension not in self.config.SUPPORTED_FILE_TYPES:
             st.error(f"Unsupported file type: {file_extension}")
             return False
+        if not upload.matches_extension():
+            st.error(f"File content does not match its extension: {upload.name}")
+            return False
         
         # Check file size
-        file_size_mb = len(uploaded_file.getvalue()) / (1024 * 1024)
+        file_size_mb = upload.size_mb
         if file_size_mb > self.config.MAX_FILE_SIZE_MB:
             st.error(f"File size ({file_size_mb:.1f}MB) exceeds limit ({self.config.MAX_FILE_SIZE_MB}MB)")
             return False
@@ -138,9 +150,10 @@ class FileProcessor:
     
     def get_file_info(self, uploaded_file) -> dict:
         """Get information about uploaded file"""
+        upload = as_upload(uploaded_file)
         return {
-            'name': uploaded_file.name,
-            'type': uploaded_file.type,
-            'size': len(uploaded_file.getvalue()),
-            'size_mb': len(uploaded_file.getvalue()) / (1024 * 1024)
+            'name': upload.name,
+            'type': upload.type,
+            'size': upload.size,
+            'size_mb': upload.size_mb
         }
\ No newline at end of file
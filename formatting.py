@@ -1,11 +1,15 @@
-def generate_mom_html(mom_data):
-    header = mom_data.get("meeting_header", {})
-    participants = mom_data.get("participants", {})
-    discussion_points = mom_data.get("discussion_points", {})
-    additional = mom_data.get("additional", {})
-    #participants = mom_data["participants"]
-    #discussions = mom_data["discussion_points"]
-    #additional = mom_data["additional_info"]
+import io
+from html import escape
+from typing import Union
+from docx import Document
+from docx.shared import Pt
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from mom_model import TABLE_COLUMNS, MinutesOfMeeting
+
+def generate_mom_html(mom: MinutesOfMeeting) -> str:
+    mom = MinutesOfMeeting.from_dict(mom)
+    header = mom.meeting_header
+    additional = mom.additional_info
 
     html = f"""
     <html>
@@ -37,21 +41,21 @@ def generate_mom_html(mom_data):
         <h1>Minutes of Meeting</h1>
         <h2>Meeting Information</h2>
         <table>
-            <tr><th>Project</th><td>{header.get('project_name', 'N/A')}</td></tr>
-            <tr><th>Project</th><td>{header.get('meeting_subject', 'N/A')}</td></tr>
-            <tr><th>Project</th><td>{header.get('meeting_date', 'N/A')}</td></tr>
-            <tr><th>Project</th><td>{header.get('meeting_time', 'N/A')}</td></tr>
-            <tr><th>Project</th><td>{header.get('venue', 'N/A')}</td></tr>
-            <tr><th>Project</th><td>{header.get('mom_number', 'N/A')}</td></tr>
-            <tr><th>Project</th><td>{header.get('minutes_by', 'N/A')}</td></tr>
+            <tr><th>Project</th><td>{escape(header.project_name)}</td></tr>
+            <tr><th>Subject</th><td>{escape(header.meeting_subject)}</td></tr>
+            <tr><th>Date</th><td>{escape(header.meeting_date)}</td></tr>
+            <tr><th>Time</th><td>{escape(header.meeting_time)}</td></tr>
+            <tr><th>Venue</th><td>{escape(header.venue)}</td></tr>
+            <tr><th>MoM No.</th><td>{escape(header.mom_number)}</td></tr>
+            <tr><th>Minutes By</th><td>{escape(header.minutes_by)}</td></tr>
         </table>
 
         <h2>Participants</h2>
         <table>
             <tr><th>Sl. No</th><th>Organization</th><th>Name</th></tr>
     """
-    for p in participants:
-        html += f"<tr><td>{p['sl_no']}</td><td>{p['consultant_organization']}</td><td>{p['participant_name']}</td></tr>"
+    for p in mom.participants:
+        html += f"<tr><td>{p.sl_no}</td><td>{escape(p.consultant_organization)}</td><td>{escape(p.participant_name)}</td></tr>"
 
     html += """
         </table>
@@ -59,21 +63,57 @@ def generate_mom_html(mom_data):
         <table>
             <tr><th>Sl. No</th><th>Topic</th><th>Decision</th><th>Responsible</th><th>Target Date</th></tr>
     """
-    for d in discussion_points:
-        html += f"<tr><td>{d['sl_no']}</td><td>{d['topic_head']}</td><td>{d['discussion_decision']}</td><td>{d['responsible_team']}</td><td>{d['target_date']}</td></tr>"
+    for d in mom.discussion_points:
+        html += f"<tr><td>{d.sl_no}</td><td>{escape(d.topic_head)}</td><td>{escape(d.discussion_decision)}</td><td>{escape(d.responsible_team)}</td><td>{escape(d.target_date)}</td></tr>"
 
     html += f"""
         </table>
         <h2>Additional Information</h2>
         <table>
-            <tr><th>Project</th><td>{header.get('project_name', 'N/A')}</td></tr>
-            <tr><th>Distribution List</th><td>{additional.get('distribution_list',"N/A")}</td></tr>
-            <tr><th>Distribution List</th><td>{additional.get('attachments',"N/A")}</td></tr>
-            #<tr><th>Distribution List</th><td>{additional.get("date", "N/A")}</td></tr>
-            <tr><th>Distribution List</th><td>{additional.get('time', "N/A")}</td></tr>
-            <tr><th>Response Deadline</th><td>{additional.get('response_deadline', "N/A")}</td></tr>
+            <tr><th>Distribution List</th><td>{escape(additional.distribution_list)}</td></tr>
+            <tr><th>Attachments</th><td>{escape(additional.attachments)}</td></tr>
+            <tr><th>Next Meeting</th><td>{escape(additional.next_meeting.date)}, {escape(additional.next_meeting.venue)}</td></tr>
+            <tr><th>Response Deadline</th><td>{escape(additional.response_deadline)}</td></tr>
         </table>
     </body>
     </html>
     """
     return html
+
+def generate_word_file(mom: Union[MinutesOfMeeting, str]) -> io.BytesIO:
+
+    """
+     Converts a MinutesOfMeeting (or a tabular markdown AI response, which is parsed
+    once into one) into a formatted Word document.
+    """
+    if isinstance(mom, str):
+        mom = MinutesOfMeeting.from_markdown(mom)
+    doc = Document()
+
+    # Title
+    title = doc.add_heading("Minutes of Meeting", level=0)
+    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+    doc.add_paragraph(f"Date: {mom.meeting_header.meeting_date}")
+
+    table = doc.add_table(rows=1, cols=len(TABLE_COLUMNS))
+    table.style = "Table Grid"
+    for cell, column in zip(table.rows[0].cells, TABLE_COLUMNS):
+        cell.text = column
+    for row in mom.table_rows():
+        for cell, value in zip(table.add_row().cells, row):
+            cell.text = value
+
+    if mom.summary or mom.action_items:
+        doc.add_paragraph()
+        doc.add_heading("Summary & Key Action Items", level=1)
+        for line in mom.summary.split('\n') + [f"• {item}" for item in mom.action_items]:
+            if line:
+                para = doc.add_paragraph(line)
+                para.style.font.size = Pt(11)
+
+    # Save to buffer
+    word_io = io.BytesIO()
+    doc.save(word_io)
+    word_io.seek(0)
+    return word_io
@@ -3,19 +3,21 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from dotenv import load_dotenv
-import google.generativeai as genai
 import base64
 from PIL import Image
 import io
 import json
-import streamlit as st
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 import io
+from resource_manager import get_resource_manager
+from langchain.schema import HumanMessage
+from config import Config, PromptTemplates
+from normalization import normalize_table_model
+from mom_model import MOM_RESPONSE_SCHEMA, MinutesOfMeeting
 
 load_dotenv()
-genai.configure(api_key=os.getenv("gemini_api_key"))
 
 # Hardcoded MoM generation prompt
 MOM_PROMPT = """
@@ -69,44 +71,70 @@ This may be exported in word file so generate the output which is doc friendly.
 Begin processing below input:{raw_data}
 """
 
-def extract_text_from_image(img_path: str) -> str:
+# Slim variant: floor names, "Not Mentioned"/"TBD" placeholders, date and status
+# formats are applied afterwards by normalize_table_model
+MOM_PROMPT_SLIM = """
+You are a Project Manager assistant for construction, civil, MEP, electrical, waterproofing and finishing work.
+Turn the meeting notes below (possibly handwritten/OCR) into one markdown table, one row per task:
+
+| Work Area | Sub-Activity/Component | Floor/Zone/Section | Description / Remarks | Assigned To (if any) | Deadline (DD/MM/YYYY) | Status / Completion % |
+|-----------|------------------------|---------------------|------------------------|----------------------|------------------------|------------------------|
+
+Work Area is a category such as Fire, Civil, Plumbing, Waterproofing, Electrical, Putty, Snowcem. Leave unknown cells empty; copy floors, dates and status as written.
+Then add a "Summary & Key Action Items" section with a short To Do list.
+
+Notes:{raw_data}
+"""
+
+def extract_text_from_image(img_path: str, config: Config = None, api_key: str = None) -> str:
     """
-    Uses Gemini 1.5 Flash to extract and interpret text from a handwritten image.
+    Uses Gemini (the profile's model tier) to extract and interpret text from a handwritten image.
+    api_key defaults to the gemini_api_key environment variable.
     """
+    config = config or Config()
     with open(img_path, "rb") as f:
         image_data = f.read()
 
     image_base64 = base64.b64encode(image_data).decode("utf-8")
 
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    response = model.generate_content(
-        contents=[
-            {
-                "role": "user",
-                "parts": [
-                    {"text": "Extract all handwritten content accurately from this image."},
-                    {"inline_data": {"mime_type": "image/jpeg", "data": image_base64}},
-                ],
-            }
-        ]
-    )
-    return response.text
-
-def generate_minutes_of_meeting(raw_text: str) -> str:
+    # The shared per-key client, so concurrent jobs with different keys do not mix them up
+    llm = get_resource_manager().get_llm(api_key or os.getenv("gemini_api_key"), model=config.GEMINI_MODEL)
+    response = llm.invoke([HumanMessage(content=[
+        {"type": "text", "text": "Extract all handwritten content accurately from this image."},
+        {"type": "image_url", "image_url": f"data:image/jpeg;base64,{image_base64}"},
+    ])])
+    return response.content
+
+def generate_minutes_of_meeting(raw_text: str, config: Config = None, api_key: str = None) -> MinutesOfMeeting:
     """
     Takes raw OCR or text and generates structured MoM.
+    api_key defaults to the gemini_api_key environment variable.
     """
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-1.5-flash",
-        google_api_key=os.getenv("gemini_api_key")
-    )
-
-    prompt = PromptTemplate(
-        input_variables=["raw_data"],
-        template=MOM_PROMPT
-    )
-
-    chain = LLMChain(llm=llm, prompt=prompt)
-    response_text  = chain.run({"raw_data": raw_text})
-    st.write(response_text)
-    return(response_text)
\ No newline at end of file
+    config = config or Config()
+    api_key = api_key or os.getenv("gemini_api_key")
+    resources = get_resource_manager()
+    if config.USE_STRUCTURED_OUTPUT:
+        # Schema-constrained JSON maps straight onto the typed model
+        llm = resources.get_llm(
+            api_key,
+            model=config.GEMINI_MODEL,
+            response_schema=MOM_RESPONSE_SCHEMA
+        )
+        response = llm.invoke([HumanMessage(content=PromptTemplates.get_structured_prompt(raw_text))])
+        mom = MinutesOfMeeting.from_dict(json.loads(response.content))
+    else:
+        llm = resources.get_llm(
+            api_key,
+            model=config.GEMINI_MODEL
+        )
+
+        prompt = PromptTemplate(
+            input_variables=["raw_data"],
+            template=MOM_PROMPT_SLIM if config.USE_SLIM_PROMPTS else MOM_PROMPT
+        )
+
+        chain = LLMChain(llm=llm, prompt=prompt)
+        mom = MinutesOfMeeting.from_markdown(chain.run({"raw_data": raw_text}))
+
+    mom = normalize_table_model(mom)
+    return mom
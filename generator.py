@@ -1,65 +1,81 @@
 import streamlit as st
 import pandas as pd
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import HumanMessage
-import pytesseract
 from PIL import Image
 import mammoth
-import PyPDF2
 import io
 import json
-from typing import Dict, Any
+from typing import Iterator, Optional
+from config import Config, PromptTemplates
+from resource_manager import get_resource_manager
+from text_pipeline import TextSegment
+from normalization import MoMNormalizer
+from mom_model import MOM_RESPONSE_SCHEMA, MinutesOfMeeting
+from uploads import as_upload
 
-# Set the tesseract path manually
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+def iter_file_segments(uploaded_file, config: Optional[Config] = None) -> Iterator[TextSegment]:
+    """Yield (source, page, text) segments with the profile's shared engines; errors are raised
+
+    Needs no API key, so the HTTP service can start it as soon as a file is uploaded.
+    """
+    resources = get_resource_manager()
+    config = config or resources.config
+    uploaded_file = as_upload(uploaded_file)
+    file_type = uploaded_file.type
+    name = uploaded_file.name
+    if file_type.startswith('image/'):
+        ocr_engine = resources.get_ocr_engine(config)
+        frames = ocr_engine.iter_frames_text(Image.open(uploaded_file), preprocess=ocr_engine.preprocessor())
+        for frame_num, frame_text in frames:
+            yield TextSegment(name, frame_num, frame_text)
+    elif file_type == 'application/pdf':
+        pages = resources.get_pdf_engine(config).iter_pages(uploaded_file)
+        for page_num, page_text in enumerate(pages, start=1):
+            yield TextSegment(name, page_num, page_text + "\n")
+    elif file_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
+        yield TextSegment(name, 1, mammoth.extract_raw_text(uploaded_file).value)
+    elif file_type == 'text/plain':
+        yield TextSegment(name, 1, str(uploaded_file.buffer(), "utf-8"))
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
 
 
 class MoMGenerator:
-    def __init__(self, gemini_api_key: str):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=gemini_api_key,
-        )
+    def __init__(self, gemini_api_key: str, config: Optional[Config] = None):
+        resources = get_resource_manager()
+        # The performance profile picks the model tier and the OCR/PDF engines
+        self.config = config or resources.config
+        # Shared per key and model, so constructing a generator on every rerun is cheap
+        self.llm = resources.get_llm(gemini_api_key, model=self.config.GEMINI_MODEL)
+        self.structured_llm = resources.get_llm(
+            gemini_api_key, model=self.config.GEMINI_MODEL, response_schema=MOM_RESPONSE_SCHEMA
+        ) if self.config.USE_STRUCTURED_OUTPUT else None
+        self.ocr_engine = resources.get_ocr_engine(self.config)
+        self.pdf_engine = resources.get_pdf_engine(self.config)
+
+    def iter_text_segments(self, uploaded_file) -> Iterator[TextSegment]:
+        """Yield (source, page, text) segments; extraction errors are raised to the caller"""
+        return iter_file_segments(uploaded_file, self.config)
 
     def extract_text_from_file(self, uploaded_file) -> str:
-        file_type = uploaded_file.type
         try:
-            if file_type.startswith('image/'):
-                return self._extract_from_image(uploaded_file)
-            elif file_type == 'application/pdf':
-                return self._extract_from_pdf(uploaded_file)
-            elif file_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-                return self._extract_from_docx(uploaded_file)
-            elif file_type == 'text/plain':
-                return str(uploaded_file.read(), "utf-8")
-            else:
-                st.error(f"Unsupported file type: {file_type}")
-                return ""
+            return "".join(segment.text for segment in self.iter_text_segments(uploaded_file))
         except Exception as e:
             st.error(f"Error extracting text from file: {str(e)}")
             return ""
 
-    def _extract_from_image(self, uploaded_file) -> str:
-        image = Image.open(uploaded_file)
-        return pytesseract.image_to_string(image)
-
-    def _extract_from_pdf(self, uploaded_file) -> str:
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-
-    def _extract_from_docx(self, uploaded_file) -> str:
-        result = mammoth.extract_raw_text(uploaded_file)
-        return result.value
-
     def generate_mom_prompt(self) -> str:
         return "You are an expert meeting minutes analyzer. Extract and structure meeting information from the provided text into a standardized format. OUTPUT FORMAT: JSON {...}"
 
-    def process_text_with_gemini(self, text: str) -> Dict[str, Any]:
-        prompt = self.generate_mom_prompt() + f"\n\n{text}"
-        try:
+    def process_text_with_gemini(self, text: str) -> MinutesOfMeeting:
+        """Generate the MoM; Gemini and parsing errors are raised so the job fails with them"""
+        if self.structured_llm is not None:
+            # Schema-constrained output is bare JSON that maps straight onto the model
+            response = self.structured_llm.invoke([HumanMessage(content=PromptTemplates.get_structured_prompt(text))])
+            json_text = response.content
+        else:
+            prompt = self.generate_mom_prompt() + f"\n\n{text}"
             response = self.llm.invoke([HumanMessage(content=prompt)])
             response_text = response.content
             if "```json" in response_text:
@@ -68,59 +84,34 @@ class MoMGenerator:
                 json_text = response_text[json_start:json_end].strip()
             else:
                 json_text = response_text
-            return json.loads(json_text)
-        except Exception as e:
-            st.error(f"Error processing with Gemini: {str(e)}")
-            return self._get_default_structure()
-
-    def _get_default_structure(self) -> Dict[str, Any]:
-        return {
-            "meeting_header": {
-                "project_name": "Not specified",
-                "meeting_subject": "Not specified",
-                "meeting_date": "Not specified",
-                "meeting_time": "Not specified",
-                "venue": "Not specified",
-                "mom_number": "Not specified",
-                "minutes_by": "Not specified"
-            },
-            "participants": [],
-            "discussion_points": [],
-            "additional_info": {
-                "distribution_list": "Not specified",
-                "attachments": "Not specified",
-                "next_meeting": {"date": "Not specified", "venue": "Not specified"},
-                "response_deadline": "Not specified"
-            }
-        }
+        try:
+            data = json.loads(json_text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Gemini returned invalid JSON: {e}") from e
+        return MoMNormalizer(self.config).normalize_model(MinutesOfMeeting.from_dict(data))
 
-    def create_excel_file(self, mom_data: Dict[str, Any]) -> io.BytesIO:
+    def create_excel_file(self, mom: MinutesOfMeeting) -> io.BytesIO:
+        mom = MinutesOfMeeting.from_dict(mom)
         output = io.BytesIO()
         with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Always write at least one sheet
-            if 'meeting_header' in mom_data:
-                pd.DataFrame([[k, v] for k, v in mom_data['meeting_header'].items()], columns=['Field', 'Value']).to_excel(writer, sheet_name='Meeting_Info', index=False)
-            
-            if mom_data.get('participants'):
-                pd.DataFrame(mom_data['participants']).to_excel(writer, sheet_name='Participants', index=False)
-            
-            if mom_data.get('discussion_points'):
-                pd.DataFrame(mom_data['discussion_points']).to_excel(writer, sheet_name='Minutes_of_Meeting', index=False)
-            
-            if 'additional_info' in mom_data:
-                additional = mom_data['additional_info']
-                add_data = [
-                    ['Distribution List', additional.get('distribution_list', 'Not specified')],
-                    ['Attachments', additional.get('attachments', 'Not specified')],
-                    ['Next Meeting Date', additional.get('next_meeting', {}).get('date', 'Not specified')],
-                    ['Next Meeting Venue', additional.get('next_meeting', {}).get('venue', 'Not specified')],
-                    ['Response Deadline', additional.get('response_deadline', 'Not specified')]
-                ]
-                pd.DataFrame(add_data, columns=['Field', 'Value']).to_excel(writer, sheet_name='Additional_Info', index=False)
-            
-            # Fallback: if still no sheets written, write dummy data
-            if not writer.sheets:
-                pd.DataFrame([["No data extracted"]], columns=["Message"]).to_excel(writer, sheet_name="Summary", index=False)
+            header = mom.meeting_header.to_dict()
+            pd.DataFrame(list(header.items()), columns=['Field', 'Value']).to_excel(writer, sheet_name='Meeting_Info', index=False)
+
+            if mom.participants:
+                pd.DataFrame([p.to_dict() for p in mom.participants]).to_excel(writer, sheet_name='Participants', index=False)
+
+            if mom.discussion_points:
+                pd.DataFrame([p.to_dict() for p in mom.discussion_points]).to_excel(writer, sheet_name='Minutes_of_Meeting', index=False)
+
+            additional = mom.additional_info
+            add_data = [
+                ['Distribution List', additional.distribution_list],
+                ['Attachments', additional.attachments],
+                ['Next Meeting Date', additional.next_meeting.date],
+                ['Next Meeting Venue', additional.next_meeting.venue],
+                ['Response Deadline', additional.response_deadline]
+            ]
+            pd.DataFrame(add_data, columns=['Field', 'Value']).to_excel(writer, sheet_name='Additional_Info', index=False)
 
         output.seek(0)
         return output
@@ -0,0 +1,312 @@
+# Background job module for MoM Generator
+# SQLite-backed job queue so generation keeps running across Streamlit reruns
+
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+from uploads import Upload, as_upload
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL,
+    files TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_owners (
+    id TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job has been cancelled"""
+
+
+class JobContext:
+    """Everything a handler needs to run one job"""
+
+    def __init__(self, queue: "JobQueue", job_id: str, payload: Dict[str, Any],
+                 files: List[Dict[str, str]], secrets: Dict[str, str]):
+        self.queue = queue
+        self.id = job_id
+        self.payload = payload
+        self.files = files
+        self.secrets = secrets
+        self.workdir = queue.job_dir(job_id)
+
+    def open_files(self) -> List[Upload]:
+        """Open the job's input files (disk-backed, read through mmap) in upload order"""
+        return [Upload(f['path'], name=f['name'], type=f['type']) for f in self.files]
+
+    def report(self, progress: float, message: str = '') -> None:
+        """Persist progress (0..1) and raise JobCancelled if the job was cancelled"""
+        if self.queue.is_cancelled(self.id):
+            raise JobCancelled(self.id)
+        self.queue._update(self.id, progress=progress, message=message)
+
+
+class JobQueue:
+    """Local job queue persisted in SQLite and drained by worker threads
+
+    Several processes (app, CLI, HTTP service) may share one database. Each queue
+    only runs the jobs it submitted, since their secrets live in its memory, and
+    only fails the jobs of queues that stopped heartbeating.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: Optional[int] = None,
+                 config: Optional[Config] = None):
+        """Open (or create) the job database and recover interrupted jobs"""
+        self.config = config or Config()
+        self.root = os.path.join(self.config.DATA_DIR, 'jobs')
+        os.makedirs(self.root, exist_ok=True)
+        self.db_path = db_path or os.path.join(self.config.DATA_DIR, 'jobs.sqlite3')
+        self.num_workers = workers or self.config.JOB_WORKERS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._handlers: Dict[str, Callable[[JobContext], Dict[str, Any]]] = {}
+        # Secrets such as API keys are kept in memory only, never in the database
+        self._secrets: Dict[str, Dict[str, str]] = {}
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'owner' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_owner_status_created "
+                         "ON jobs (owner, status, created_at)")
+        self._heartbeat()
+        self._recover_interrupted()
+        self.purge_expired()
+
+    def register_handler(self, kind: str, handler: Callable[[JobContext], Dict[str, Any]]) -> None:
+        """Register the function that runs jobs of the given kind"""
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        """Start the worker and heartbeat threads (idempotent)"""
+        if self._threads:
+            return
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"mom-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat_loop, name="mom-job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker and heartbeat threads to finish their current job and exit"""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def submit(self, kind: str, payload: Dict[str, Any], uploaded_files: List = (),
+               secrets: Optional[Dict[str, str]] = None) -> str:
+        """Persist a job and its input files, returning the job ID"""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        workdir = self.job_dir(job_id)
+        input_dir = os.path.join(workdir, 'input')
+        os.makedirs(input_dir, exist_ok=True)
+
+        files = []
+        for i, uploaded_file in enumerate(uploaded_files):
+            path = os.path.join(input_dir, f"{i:03d}_{os.path.basename(uploaded_file.name)}")
+            as_upload(uploaded_file).save_to(path)
+            files.append({'path': path, 'name': uploaded_file.name, 'type': uploaded_file.type})
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, files, created_at, updated_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, JOB_QUEUED, json.dumps(payload), json.dumps(files), now, now, self.owner)
+            )
+        if secrets:
+            self._secrets[job_id] = dict(secrets)
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the current state of a job, or None if it is unknown"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['files'] = json.loads(job['files'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel a job; running jobs stop at their next progress report"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (JOB_CANCELLED, time.time(), job_id, JOB_QUEUED, JOB_RUNNING)
+            )
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """Return True if the job has been cancelled"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row['status'] == JOB_CANCELLED
+
+    def job_dir(self, job_id: str) -> str:
+        """Return the working directory holding a job's inputs and exports"""
+        return os.path.join(self.root, job_id)
+
+    def purge_expired(self) -> None:
+        """Delete finished jobs older than the retention period, with their files"""
+        cutoff = time.time() - self.config.JOB_RETENTION_HOURS * 3600
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE updated_at < ? AND status IN (?, ?, ?)",
+                (cutoff, *FINISHED_STATES)
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(row['id'],) for row in rows])
+        for row in rows:
+            shutil.rmtree(self.job_dir(row['id']), ignore_errors=True)
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection; each thread uses its own short-lived connection"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
+    def _connect(self):
+        """Yield a connection that commits on success and is always closed"""
+        conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        """Update columns of a job row"""
+        fields['updated_at'] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def _heartbeat(self) -> None:
+        """Record that this queue's process is alive"""
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO job_owners (id, heartbeat_at) VALUES (?, ?)",
+                         (self.owner, time.time()))
+
+    def _heartbeat_loop(self) -> None:
+        """Heartbeat, fail orphaned jobs and purge expired ones until the queue is stopped"""
+        while not self._stopping.wait(self.config.JOB_HEARTBEAT_SECONDS):
+            self._heartbeat()
+            self._recover_interrupted()
+            self.purge_expired()
+
+    def _recover_interrupted(self) -> None:
+        """Fail unfinished jobs whose process died (stopped heartbeating) before running them"""
+        cutoff = time.time() - self.config.JOB_OWNER_TIMEOUT_SECONDS
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?) AND "
+                "(owner IS NULL OR owner NOT IN (SELECT id FROM job_owners WHERE heartbeat_at >= ?))",
+                (JOB_FAILED, "Interrupted by a server restart, please resubmit",
+                 time.time(), JOB_QUEUED, JOB_RUNNING, cutoff)
+            )
+            conn.execute("DELETE FROM job_owners WHERE heartbeat_at < ?", (cutoff,))
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        """Atomically move this queue's oldest queued job to running and return it"""
+        conn = self._open()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE owner = ? AND status = ? ORDER BY created_at LIMIT 1",
+                (self.owner, JOB_QUEUED)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                    (JOB_RUNNING, time.time(), row['id'])
+                )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _worker_loop(self) -> None:
+        """Run queued jobs until the queue is stopped"""
+        while not self._stopping.is_set():
+            row = self._claim_next()
+            if row is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.config.JOB_POLL_INTERVAL_SECONDS)
+                continue
+            self._run(row)
+
+    def _run(self, row: sqlite3.Row) -> None:
+        """Run one claimed job and persist its outcome"""
+        job_id = row['id']
+        context = JobContext(self, job_id, json.loads(row['payload']), json.loads(row['files']),
+                             self._secrets.pop(job_id, {}))
+        try:
+            result = self._handlers[row['kind']](context)
+        except JobCancelled:
+            return
+        except Exception as e:
+            if not self.is_cancelled(job_id):
+                self._update(job_id, status=JOB_FAILED, error=str(e))
+            return
+        finally:
+            # The input copies are only needed while the job runs; exports stay until purged
+            shutil.rmtree(os.path.join(self.job_dir(job_id), 'input'), ignore_errors=True)
+
+        if not self.is_cancelled(job_id):
+            self._update(job_id, status=JOB_DONE, progress=1.0, message='Done',
+                         result=json.dumps(result))
@@ -0,0 +1,167 @@
+# Load test for MoM Generator
+# Drives the HTTP service (service.py) with the stub LLM and reports requests/s and latency percentiles
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+import aiohttp
+
+from benchmark import print_table, synthetic_line
+from config import Config, PERFORMANCE_PROFILES
+from job_queue import FINISHED_STATES, JOB_DONE
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def meeting_notes(seed: int, lines: int) -> bytes:
+    """Synthetic meeting notes; the same seed gives the same file"""
+    rng = random.Random(seed)
+    return "\n".join(synthetic_line(i, rng) for i in range(lines)).encode('utf-8')
+
+
+async def generate_once(session: aiohttp.ClientSession, url: str, notes: bytes,
+                        export_format: str, profile: str) -> float:
+    """Upload, generate and download one MoM; returns the end-to-end latency in seconds"""
+    start = time.perf_counter()
+    form = aiohttp.FormData()
+    form.add_field('files', notes, filename='notes.txt', content_type='text/plain')
+    async with session.post(f"{url}/uploads", params={'profile': profile}, data=form) as response:
+        response.raise_for_status()
+        upload_ids = [upload['upload_id'] for upload in (await response.json())['uploads']]
+
+    async with session.post(f"{url}/jobs", json={'uploads': upload_ids, 'format': export_format,
+                                                 'profile': profile}) as response:
+        response.raise_for_status()
+        job_id = (await response.json())['job_id']
+
+    state = {'status': None}
+    while state['status'] not in FINISHED_STATES:
+        async with session.get(f"{url}/jobs/{job_id}", params={'wait': '30'}) as response:
+            response.raise_for_status()
+            state = await response.json()
+    if state['status'] != JOB_DONE:
+        raise RuntimeError(f"job {state['status']}: {state['error']}")
+
+    async with session.get(f"{url}{state['exports'][export_format]}") as response:
+        response.raise_for_status()
+        await response.read()
+    return time.perf_counter() - start
+
+
+async def run_load(url: str, requests: int, concurrency: int, distinct: float, lines: int,
+                   export_format: str, profile: str) -> List[List[object]]:
+    """Fire requests with bounded concurrency and summarize the results"""
+    # A share of requests repeats earlier files, as re-uploads do, and hits the caches
+    pool_size = max(1, round(requests * distinct))
+    files = [meeting_notes(seed, lines) for seed in range(pool_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def worker(i: int) -> None:
+        async with semaphore:
+            try:
+                latencies.append(await generate_once(session, url, files[i % pool_size], export_format, profile))
+            except Exception as e:
+                errors.append(str(e))
+
+    timeout = aiohttp.ClientTimeout(total=None)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    rows: List[List[object]] = [
+        ['requests (ok / failed)', f"{len(latencies)} / {len(errors)}"],
+        ['concurrency', concurrency],
+        ['wall time', f"{elapsed:.2f} s"],
+        ['throughput', f"{len(latencies) / elapsed:.2f} req/s"],
+    ]
+    if latencies:
+        rows += [[f"p{pct} latency", f"{percentile(latencies, pct) * 1000:.0f} ms"] for pct in (50, 95, 99)]
+        rows.append(['max latency', f"{max(latencies) * 1000:.0f} ms"])
+    if errors:
+        rows.append(['first error', errors[0][:120]])
+    return rows
+
+
+def free_port() -> int:
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    """Poll /health until the service answers"""
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"service exited with code {process.returncode}")
+            try:
+                async with session.get(f"{url}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("service did not start in time")
+
+
+def start_service(profile: str, llm_latency_ms: int, data_dir: str) -> Tuple[subprocess.Popen, str]:
+    """Start service.py with the stub LLM on a free port"""
+    port = free_port()
+    env = dict(os.environ, MOM_LLM_STUB='1', MOM_LLM_STUB_LATENCY_MS=str(llm_latency_ms), MOM_DATA_DIR=data_dir)
+    service = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'service.py')
+    process = subprocess.Popen([sys.executable, service, '--port', str(port), '--profile', profile], env=env)
+    return process, f"http://127.0.0.1:{port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the MoM Generator HTTP service")
+    parser.add_argument('--url', help="test a running service instead of starting one with the stub LLM")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--distinct', type=float, default=0.5,
+                        help="share of requests with a file not uploaded before (0-1)")
+    parser.add_argument('--lines', type=int, default=40, help="lines of meeting notes per file")
+    parser.add_argument('--format', choices=['xlsx', 'docx'], default='xlsx')
+    parser.add_argument('--profile', choices=list(PERFORMANCE_PROFILES), default=Config.PERFORMANCE_PROFILE)
+    parser.add_argument('--llm-latency-ms', type=int, default=Config.LLM_STUB_LATENCY_MS,
+                        help="simulated Gemini latency of the stub LLM")
+    args = parser.parse_args()
+
+    process: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory(prefix="mom-loadtest-") as data_dir:
+        url = args.url
+        try:
+            if url is None:
+                process, url = start_service(args.profile, args.llm_latency_ms, data_dir)
+                asyncio.run(wait_until_up(url, process))
+            rows = asyncio.run(run_load(url.rstrip('/'), args.requests, args.concurrency, args.distinct,
+                                        args.lines, args.format, args.profile))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+
+    target = url if args.url else f"stub LLM, {args.llm_latency_ms} ms"
+    print_table(f"Load test ({target}, profile '{args.profile}', {args.format})", rows)
+
+
+if __name__ == "__main__":
+    main()
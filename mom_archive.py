@@ -0,0 +1,301 @@
+# Archive module for MoM Generator
+# Persists generated MoMs in SQLite with indexed, full-text searchable action items
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from normalization import parse_date
+from mom_model import MinutesOfMeeting
+
+POINT_OPEN = 'open'
+POINT_CLOSED = 'closed'
+POINT_INFO = 'info'
+POINT_CARRIED = 'carried'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    project_name TEXT COLLATE NOCASE,
+    meeting_subject TEXT,
+    meeting_date TEXT,
+    meeting_date_iso TEXT,
+    mom_number TEXT,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS discussion_points (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    sl_no TEXT,
+    topic_head TEXT,
+    discussion_decision TEXT,
+    responsible_team TEXT COLLATE NOCASE,
+    target_date TEXT,
+    target_date_iso TEXT,
+    project_name TEXT COLLATE NOCASE,
+    meeting_date_iso TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    status_source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_project_date ON meetings (project_name, meeting_date_iso);
+CREATE INDEX IF NOT EXISTS idx_points_meeting ON discussion_points (meeting_id);
+CREATE INDEX IF NOT EXISTS idx_points_team_target ON discussion_points (responsible_team, target_date_iso);
+CREATE INDEX IF NOT EXISTS idx_points_target ON discussion_points (target_date_iso);
+CREATE INDEX IF NOT EXISTS idx_points_project_meeting ON discussion_points (project_name, meeting_date_iso);
+CREATE INDEX IF NOT EXISTS idx_points_status_project ON discussion_points (status, project_name);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS discussion_points_fts USING fts5(
+    topic_head, discussion_decision, content='discussion_points', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS discussion_points_ai AFTER INSERT ON discussion_points BEGIN
+    INSERT INTO discussion_points_fts (rowid, topic_head, discussion_decision)
+    VALUES (new.id, new.topic_head, new.discussion_decision);
+END;
+CREATE TRIGGER IF NOT EXISTS discussion_points_ad AFTER DELETE ON discussion_points BEGIN
+    INSERT INTO discussion_points_fts (discussion_points_fts, rowid, topic_head, discussion_decision)
+    VALUES ('delete', old.id, old.topic_head, old.discussion_decision);
+END;
+CREATE TRIGGER IF NOT EXISTS discussion_points_au AFTER UPDATE OF topic_head, discussion_decision
+ON discussion_points BEGIN
+    INSERT INTO discussion_points_fts (discussion_points_fts, rowid, topic_head, discussion_decision)
+    VALUES ('delete', old.id, old.topic_head, old.discussion_decision);
+    INSERT INTO discussion_points_fts (rowid, topic_head, discussion_decision)
+    VALUES (new.id, new.topic_head, new.discussion_decision);
+END;
+"""
+
+def parse_date_iso(value: Any) -> Optional[str]:
+    """Parse a DD-MM-YYYY style (or ISO) date into YYYY-MM-DD, or None"""
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed else None
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all words (prefix match on each)"""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class MoMArchive:
+    """SQLite archive of validated MoM structures"""
+
+    def __init__(self, db_path: Optional[str] = None, config: Optional[Config] = None):
+        """Open (or create) the archive database"""
+        self.config = config or Config()
+        os.makedirs(self.config.DATA_DIR, exist_ok=True)
+        self.db_path = db_path or os.path.join(self.config.DATA_DIR, 'archive.sqlite3')
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(discussion_points)")}
+            if 'status_source' not in columns:
+                conn.execute("ALTER TABLE discussion_points ADD COLUMN status_source TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_points_status_source "
+                         "ON discussion_points (status_source)")
+
+    def add_meeting(self, mom: MinutesOfMeeting) -> int:
+        """Store a MoM (a MinutesOfMeeting or its dict form) and return its ID
+
+        A MoM with the same project, date and MoM number as an archived one
+        (e.g. regenerated from the same notes) replaces it instead of being
+        stored twice. Its points are updated in place by serial number, so they
+        keep the IDs later meetings refer to and any status those meetings set.
+        """
+        mom = MinutesOfMeeting.from_dict(mom)
+        header = mom.meeting_header
+        project_name = header.project_name
+        meeting_date_iso = parse_date_iso(header.meeting_date)
+        for_information = self.config.DEFAULT_VALUES['for_information'].lower()
+
+        with self._connect() as conn:
+            meeting_id = self._find_meeting(conn, mom)
+            values = (project_name, header.meeting_subject, header.meeting_date,
+                      meeting_date_iso, header.mom_number, json.dumps(mom.to_dict()), time.time())
+            existing: Dict[str, List[sqlite3.Row]] = {}
+            if meeting_id is None:
+                cursor = conn.execute(
+                    "INSERT INTO meetings (project_name, meeting_subject, meeting_date, meeting_date_iso, "
+                    "mom_number, data, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    values
+                )
+                meeting_id = cursor.lastrowid
+            else:
+                conn.execute(
+                    "UPDATE meetings SET project_name = ?, meeting_subject = ?, meeting_date = ?, "
+                    "meeting_date_iso = ?, mom_number = ?, data = ?, created_at = ? WHERE id = ?",
+                    (*values, meeting_id)
+                )
+                for row in conn.execute("SELECT id, sl_no, status FROM discussion_points "
+                                        "WHERE meeting_id = ? ORDER BY id", (meeting_id,)):
+                    existing.setdefault(row['sl_no'], []).append(row)
+
+            inserts = []
+            updates = []
+            for point in mom.discussion_points:
+                target_date = point.target_date
+                status = POINT_INFO if target_date.strip().lower() == for_information else POINT_OPEN
+                fields = (str(point.sl_no), point.topic_head, point.discussion_decision,
+                          point.responsible_team, target_date, parse_date_iso(target_date),
+                          project_name, meeting_date_iso)
+                same_sl_no = existing.get(str(point.sl_no))
+                previous = same_sl_no.pop(0) if same_sl_no else None
+                if previous is None:
+                    inserts.append((meeting_id, *fields, status))
+                else:
+                    # Carried or closed by a later meeting stays that way
+                    if previous['status'] not in (POINT_OPEN, POINT_INFO):
+                        status = previous['status']
+                    updates.append((*fields, status, previous['id']))
+            conn.executemany("DELETE FROM discussion_points WHERE id = ?",
+                             [(row['id'],) for rows in existing.values() for row in rows])
+            conn.executemany(
+                "UPDATE discussion_points SET sl_no = ?, topic_head = ?, discussion_decision = ?, "
+                "responsible_team = ?, target_date = ?, target_date_iso = ?, project_name = ?, "
+                "meeting_date_iso = ?, status = ? WHERE id = ?",
+                updates
+            )
+            conn.executemany(
+                "INSERT INTO discussion_points (meeting_id, sl_no, topic_head, discussion_decision, "
+                "responsible_team, target_date, target_date_iso, project_name, meeting_date_iso, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                inserts
+            )
+        return meeting_id
+
+    def meeting_key(self, mom: MinutesOfMeeting) -> Optional[str]:
+        """Identity of a MoM (project, date and MoM number), or None unless all three are known"""
+        header = MinutesOfMeeting.from_dict(mom).meeting_header
+        not_specified = self.config.DEFAULT_VALUES['not_specified']
+        meeting_date_iso = parse_date_iso(header.meeting_date)
+        if not_specified in (header.project_name, header.mom_number) or meeting_date_iso is None:
+            return None
+        return f"{header.project_name.lower()}|{meeting_date_iso}|{header.mom_number}"
+
+    def find_meeting(self, mom: MinutesOfMeeting) -> Optional[int]:
+        """Return the ID of the archived copy of a MoM (same project, date and MoM number)"""
+        with self._connect() as conn:
+            return self._find_meeting(conn, MinutesOfMeeting.from_dict(mom))
+
+    def get_meeting(self, meeting_id: int) -> Optional[Dict[str, Any]]:
+        """Return the stored MoM structure of a meeting"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def query_points(self, team: Optional[str] = None, project: Optional[str] = None,
+                     due_from: Optional[str] = None, due_to: Optional[str] = None,
+                     meeting_from: Optional[str] = None, meeting_to: Optional[str] = None,
+                     text: Optional[str] = None, status: Optional[str] = None,
+                     limit: int = 500) -> List[Dict[str, Any]]:
+        """Query archived discussion points; dates are YYYY-MM-DD, team is a prefix match"""
+        clauses = []
+        params: List[Any] = []
+
+        if team:
+            clauses.append("p.responsible_team LIKE ? ESCAPE '\\'")
+            params.append(team.replace('%', r'\%').replace('_', r'\_') + '%')
+        if project:
+            clauses.append("p.project_name = ?")
+            params.append(project)
+        if due_from:
+            clauses.append("p.target_date_iso >= ?")
+            params.append(due_from)
+        if due_to:
+            clauses.append("p.target_date_iso <= ?")
+            params.append(due_to)
+        if meeting_from:
+            clauses.append("p.meeting_date_iso >= ?")
+            params.append(meeting_from)
+        if meeting_to:
+            clauses.append("p.meeting_date_iso <= ?")
+            params.append(meeting_to)
+        if status:
+            clauses.append("p.status = ?")
+            params.append(status)
+        if text and _fts_query(text):
+            clauses.append("p.id IN (SELECT rowid FROM discussion_points_fts "
+                           "WHERE discussion_points_fts MATCH ?)")
+            params.append(_fts_query(text))
+
+        sql = "SELECT p.* FROM discussion_points p"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.target_date_iso IS NULL, p.target_date_iso, p.id LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def set_point_status(self, point_ids: List[int], status: str, source: Optional[str] = None) -> None:
+        """Set the status (open, closed, carried or info) of archived discussion points
+
+        source is the meeting_key of the MoM whose carry-forward set the status,
+        so that reopen_points can undo it when that MoM is regenerated.
+        """
+        with self._connect() as conn:
+            conn.executemany("UPDATE discussion_points SET status = ?, status_source = ? WHERE id = ?",
+                             [(status, source, point_id) for point_id in point_ids])
+
+    def reopen_points(self, source: str) -> None:
+        """Reopen the points whose status was set by the MoM with the given meeting_key"""
+        with self._connect() as conn:
+            conn.execute("UPDATE discussion_points SET status = ?, status_source = NULL "
+                         "WHERE status_source = ?", (POINT_OPEN, source))
+
+    def list_projects(self) -> List[str]:
+        """Return the distinct project names in the archive"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT project_name FROM meetings ORDER BY project_name")
+            return [row['project_name'] for row in rows if row['project_name']]
+
+    def list_teams(self) -> List[str]:
+        """Return the distinct responsible teams in the archive"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT responsible_team FROM discussion_points ORDER BY responsible_team"
+            )
+            return [row['responsible_team'] for row in rows if row['responsible_team']]
+
+    def _find_meeting(self, conn: sqlite3.Connection, mom: MinutesOfMeeting) -> Optional[int]:
+        """Look up a meeting by project, date and MoM number; None unless all three are known"""
+        if self.meeting_key(mom) is None:
+            return None
+        header = mom.meeting_header
+        row = conn.execute(
+            "SELECT id FROM meetings WHERE project_name = ? AND meeting_date_iso = ? AND mom_number = ? "
+            "ORDER BY id LIMIT 1",
+            (header.project_name, parse_date_iso(header.meeting_date), header.mom_number)
+        ).fetchone()
+        return row['id'] if row else None
+
+    @contextmanager
+    def _connect(self):
+        """Yield a connection that commits on success and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+_archive: Optional[MoMArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> MoMArchive:
+    """Return the process-wide MoM archive"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = MoMArchive()
+        return _archive
@@ -0,0 +1,137 @@
+# Job handlers for MoM Generator
+# Extract + generate + export pipelines that run on the background job queue
+
+import os
+import tempfile
+import threading
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional
+
+from PIL import Image
+
+from config import Config
+from job_queue import JobContext, JobQueue
+from mom_archive import get_archive
+from carry_forward import apply_carry_forward
+from prefetch import SegmentsFn, get_extraction_cache
+from text_pipeline import TextSegment, chunk_segments, compact_segments, dedupe_segments
+from uploads import Upload
+
+EXCEL_MOM_JOB = 'excel_mom'
+WORD_MOM_JOB = 'word_mom'
+
+
+def iter_job_segments(job: JobContext, files: List[Upload],
+                      segments_fn: SegmentsFn) -> Iterator[TextSegment]:
+    """Yield the segments of every input file, reusing speculative extractions when present"""
+    keys = job.payload.get('prefetch_keys') or []
+    cache = get_extraction_cache()
+    for i, file in enumerate(files):
+        # Waits only for whatever part of the prefetch is still running
+        prefetched = cache.segments(keys[i]) if i < len(keys) else None
+        if prefetched is not None:
+            yield from prefetched
+        else:
+            yield from segments_fn(file)
+
+
+def iter_word_mom_segments(upload: Upload, config: Optional[Config] = None,
+                           api_key: Optional[str] = None) -> Iterator[TextSegment]:
+    """Extract an image with Gemini vision, or any other file with text_extraction"""
+    from generate_mom import extract_text_from_image
+    from text_extraction import iter_text_from_file
+
+    if not upload.type.startswith("image/"):
+        yield from iter_text_from_file(upload, config)
+        return
+
+    # Gemini vision is sent the image as JPEG
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
+        Image.open(upload).convert('RGB').save(tmp, format='JPEG')
+    try:
+        yield TextSegment(upload.name, 1, extract_text_from_image(tmp.name, config, api_key))
+    finally:
+        os.remove(tmp.name)
+
+
+def run_excel_mom_job(job: JobContext) -> Dict[str, Any]:
+    """Extract text from every file, generate a JSON MoM and export it to Excel"""
+    from generator import MoMGenerator
+
+    config = Config(job.payload.get('profile'))
+    mom_gen = MoMGenerator(job.secrets.get('api_key', ''), config)
+    files = job.open_files()
+
+    # Pages stream through compaction and de-duplication as they are extracted;
+    # progress (and cancellation) is checked after every chunk
+    segments = iter_job_segments(job, files, mom_gen.iter_text_segments)
+    chunks = chunk_segments(dedupe_segments(compact_segments(segments)),
+                            config.EXTRACTION_CHUNK_CHARS)
+    parts = []
+    extracted_chars = 0
+    job.report(0.05, "Extracting text")
+    for chunk in chunks:
+        parts.append(chunk)
+        extracted_chars += len(chunk)
+        job.report(0.3, f"Extracted {extracted_chars:,} characters")
+    combined_text = "".join(parts)
+    if not combined_text.strip():
+        raise ValueError("No text could be extracted from the uploaded files")
+
+    job.report(0.6, "Generating minutes with Gemini")
+    mom = mom_gen.process_text_with_gemini(combined_text)
+
+    job.report(0.85, "Matching open items from previous meetings")
+    archive = get_archive()
+    apply_carry_forward(archive, mom)
+    meeting_id = archive.add_meeting(mom)
+
+    job.report(0.9, "Creating Excel file")
+    excel_path = os.path.join(job.workdir, 'MoM.xlsx')
+    with open(excel_path, 'wb') as out:
+        out.write(mom_gen.create_excel_file(mom).getbuffer())
+
+    return {'mom_data': mom.to_dict(), 'meeting_id': meeting_id, 'exports': {'xlsx': excel_path}}
+
+
+def run_word_mom_job(job: JobContext) -> Dict[str, Any]:
+    """Extract text from a single file, generate a tabular MoM and export it to Word"""
+    from generate_mom import generate_minutes_of_meeting
+    from formatting import generate_word_file
+
+    config = Config(job.payload.get('profile'))
+    api_key = job.secrets.get('api_key')
+    files = job.open_files()[:1]
+
+    job.report(0.1, f"Extracting content from {files[0].name}")
+    segments = iter_job_segments(job, files, partial(iter_word_mom_segments, config=config, api_key=api_key))
+    raw_text = "".join(segment.text for segment in segments)
+    if not raw_text.strip():
+        raise ValueError(f"No text could be extracted from {files[0].name}")
+
+    job.report(0.5, "Generating minutes with Gemini")
+    mom = generate_minutes_of_meeting(raw_text, config, api_key)
+
+    job.report(0.9, "Creating Word file")
+    docx_path = os.path.join(job.workdir, 'Minutes_of_Meeting.docx')
+    with open(docx_path, 'wb') as out:
+        out.write(generate_word_file(mom).getbuffer())
+
+    return {'raw_text': raw_text, 'mom_text': mom.to_markdown(), 'mom_data': mom.to_dict(),
+            'exports': {'docx': docx_path}}
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue with the MoM handlers registered and running"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+            _queue.register_handler(EXCEL_MOM_JOB, run_excel_mom_job)
+            _queue.register_handler(WORD_MOM_JOB, run_word_mom_job)
+            _queue.start()
+        return _queue
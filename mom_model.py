@@ -0,0 +1,313 @@
+# Typed MoM model for MoM Generator
+# Compact __slots__ dataclasses shared by the Gemini structured output and every exporter
+
+import re
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from normalization import column_role
+
+NOT_SPECIFIED = Config.DEFAULT_VALUES['not_specified']
+FOR_INFORMATION = Config.DEFAULT_VALUES['for_information']
+
+
+def _text(value: Any, default: str) -> str:
+    """Coerce a model value to text, using default for missing values"""
+    if value is None:
+        return default
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return str(value).strip() if str(value).strip() else default
+
+
+def _sl_no(value: Any, default: int) -> int:
+    """Coerce a serial number to int"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(slots=True)
+class MeetingHeader:
+    project_name: str = NOT_SPECIFIED
+    meeting_subject: str = NOT_SPECIFIED
+    meeting_date: str = NOT_SPECIFIED
+    meeting_time: str = NOT_SPECIFIED
+    venue: str = NOT_SPECIFIED
+    mom_number: str = NOT_SPECIFIED
+    minutes_by: str = NOT_SPECIFIED
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "MeetingHeader":
+        data = data if isinstance(data, dict) else {}
+        return cls(**{f.name: _text(data.get(f.name), NOT_SPECIFIED) for f in fields(cls)})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass(slots=True)
+class Participant:
+    sl_no: int
+    consultant_organization: str = NOT_SPECIFIED
+    participant_name: str = NOT_SPECIFIED
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], index: int) -> "Participant":
+        return cls(
+            sl_no=_sl_no(data.get('sl_no'), index),
+            consultant_organization=_text(data.get('consultant_organization'), NOT_SPECIFIED),
+            participant_name=_text(data.get('participant_name'), NOT_SPECIFIED),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'sl_no': self.sl_no, 'consultant_organization': self.consultant_organization,
+                'participant_name': self.participant_name}
+
+
+# Optional discussion point fields, only exported when set
+_POINT_EXTRAS = ('work_area', 'floor_zone', 'completion_status',
+                 'carry_forward', 'previous_point_id', 'similarity')
+
+
+@dataclass(slots=True)
+class DiscussionPoint:
+    sl_no: int
+    topic_head: str
+    discussion_decision: str = NOT_SPECIFIED
+    responsible_team: str = NOT_SPECIFIED
+    target_date: str = FOR_INFORMATION
+    # Tabular (construction site) MoM columns
+    work_area: str = ""
+    floor_zone: str = ""
+    completion_status: str = ""
+    # Filled in by carry_forward.apply_carry_forward
+    carry_forward: str = ""
+    previous_point_id: Optional[int] = None
+    similarity: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], index: int) -> "DiscussionPoint":
+        return cls(
+            sl_no=_sl_no(data.get('sl_no'), index),
+            topic_head=_text(data.get('topic_head'), f"Discussion Point {index}"),
+            discussion_decision=_text(data.get('discussion_decision'), NOT_SPECIFIED),
+            responsible_team=_text(data.get('responsible_team'), NOT_SPECIFIED),
+            target_date=_text(data.get('target_date'), FOR_INFORMATION),
+            work_area=_text(data.get('work_area'), ""),
+            floor_zone=_text(data.get('floor_zone'), ""),
+            completion_status=_text(data.get('completion_status'), ""),
+            carry_forward=_text(data.get('carry_forward'), ""),
+            previous_point_id=data.get('previous_point_id'),
+            similarity=data.get('similarity'),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {'sl_no': self.sl_no, 'topic_head': self.topic_head,
+                  'discussion_decision': self.discussion_decision,
+                  'responsible_team': self.responsible_team, 'target_date': self.target_date}
+        for name in _POINT_EXTRAS:
+            value = getattr(self, name)
+            if value not in ("", None):
+                result[name] = value
+        return result
+
+
+@dataclass(slots=True)
+class NextMeeting:
+    date: str = NOT_SPECIFIED
+    venue: str = NOT_SPECIFIED
+
+
+@dataclass(slots=True)
+class AdditionalInfo:
+    distribution_list: str = NOT_SPECIFIED
+    attachments: str = NOT_SPECIFIED
+    next_meeting: NextMeeting = field(default_factory=NextMeeting)
+    response_deadline: str = NOT_SPECIFIED
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "AdditionalInfo":
+        data = data if isinstance(data, dict) else {}
+        next_meeting = data.get('next_meeting') if isinstance(data.get('next_meeting'), dict) else {}
+        return cls(
+            distribution_list=_text(data.get('distribution_list'), NOT_SPECIFIED),
+            attachments=_text(data.get('attachments'), NOT_SPECIFIED),
+            next_meeting=NextMeeting(_text(next_meeting.get('date'), NOT_SPECIFIED),
+                                     _text(next_meeting.get('venue'), NOT_SPECIFIED)),
+            response_deadline=_text(data.get('response_deadline'), NOT_SPECIFIED),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'distribution_list': self.distribution_list,
+            'attachments': self.attachments,
+            'next_meeting': {'date': self.next_meeting.date, 'venue': self.next_meeting.venue},
+            'response_deadline': self.response_deadline,
+        }
+
+
+@dataclass(slots=True)
+class MinutesOfMeeting:
+    """Typed Minutes of Meeting consumed by every exporter"""
+    meeting_header: MeetingHeader = field(default_factory=MeetingHeader)
+    participants: List[Participant] = field(default_factory=list)
+    discussion_points: List[DiscussionPoint] = field(default_factory=list)
+    additional_info: AdditionalInfo = field(default_factory=AdditionalInfo)
+    summary: str = ""
+    action_items: List[str] = field(default_factory=list)
+    carry_forward_summary: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "MinutesOfMeeting":
+        """Build (and validate) the model from parsed JSON in a single pass"""
+        if isinstance(data, MinutesOfMeeting):
+            return data
+        data = data if isinstance(data, dict) else {}
+        participants = data.get('participants') if isinstance(data.get('participants'), list) else []
+        points = data.get('discussion_points') if isinstance(data.get('discussion_points'), list) else []
+        action_items = data.get('action_items') if isinstance(data.get('action_items'), list) else []
+        return cls(
+            meeting_header=MeetingHeader.from_dict(data.get('meeting_header')),
+            participants=[Participant.from_dict(p, i) for i, p in enumerate(participants, start=1)
+                          if isinstance(p, dict)],
+            discussion_points=[DiscussionPoint.from_dict(p, i) for i, p in enumerate(points, start=1)
+                               if isinstance(p, dict)],
+            additional_info=AdditionalInfo.from_dict(data.get('additional_info')),
+            summary=_text(data.get('summary'), ""),
+            action_items=[str(item) for item in action_items if str(item).strip()],
+            carry_forward_summary=dict(data.get('carry_forward_summary') or {}),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, matching the structure returned by _validate_and_clean_data"""
+        result = {
+            'meeting_header': self.meeting_header.to_dict(),
+            'participants': [p.to_dict() for p in self.participants],
+            'discussion_points': [p.to_dict() for p in self.discussion_points],
+            'additional_info': self.additional_info.to_dict(),
+        }
+        if self.summary:
+            result['summary'] = self.summary
+        if self.action_items:
+            result['action_items'] = list(self.action_items)
+        if self.carry_forward_summary:
+            result['carry_forward_summary'] = dict(self.carry_forward_summary)
+        return result
+
+    @classmethod
+    def from_markdown(cls, response_text: str) -> "MinutesOfMeeting":
+        """Parse a tabular (markdown) MoM response once into the typed model"""
+        mom = cls()
+        roles = None
+        in_summary = False
+        summary_lines: List[str] = []
+        for line in response_text.strip().split('\n'):
+            line = line.strip()
+            if in_summary:
+                if line:
+                    summary_lines.append(line)
+            elif line.lower().startswith("date:"):
+                mom.meeting_header.meeting_date = line.split(':', 1)[1].strip() or NOT_SPECIFIED
+            elif "summary & key action items" in line.lower():
+                in_summary = True
+            elif line.startswith('|') or line.count('|') >= 2:
+                cells = [cell.strip() for cell in line.strip('|').split('|')]
+                if roles is None:
+                    roles = [column_role(cell) for cell in cells]
+                elif not _TABLE_SEPARATOR.match(line):
+                    mom.discussion_points.append(_point_from_cells(cells, roles, len(mom.discussion_points) + 1))
+            else:
+                roles = None
+
+        mom.action_items = [_BULLET.sub('', line) for line in summary_lines if _BULLET.match(line)]
+        mom.summary = "\n".join(line for line in summary_lines if not _BULLET.match(line))
+        return mom
+
+    def to_markdown(self) -> str:
+        """Render the tabular MoM as markdown (used for on-screen display)"""
+        lines = [f"**Date:** {self.meeting_header.meeting_date}", "",
+                 "| " + " | ".join(TABLE_COLUMNS) + " |",
+                 "|" + "---|" * len(TABLE_COLUMNS)]
+        for row in self.table_rows():
+            lines.append("| " + " | ".join(cell.replace('|', '/') for cell in row) + " |")
+        if self.summary or self.action_items:
+            lines += ["", "### Summary & Key Action Items"]
+            if self.summary:
+                lines.append(self.summary)
+            lines += [f"- {item}" for item in self.action_items]
+        return "\n".join(lines)
+
+    def table_rows(self) -> List[List[str]]:
+        """Rows of the tabular MoM, in TABLE_COLUMNS order"""
+        return [[p.work_area, p.topic_head, p.floor_zone, p.discussion_decision,
+                 p.responsible_team, p.target_date, p.completion_status]
+                for p in self.discussion_points]
+
+
+TABLE_COLUMNS = ['Work Area', 'Sub-Activity/Component', 'Floor/Zone/Section', 'Description / Remarks',
+                 'Assigned To', 'Deadline', 'Status / Completion %']
+
+_TABLE_SEPARATOR = re.compile(r'^\|?\s*:?-{3,}')
+_BULLET = re.compile(r'^(?:[-*•]|\d+[.)])\s+')
+
+# Table column role (see normalization.column_role) -> DiscussionPoint attribute
+_ROLE_ATTRIBUTES = {'work_area': 'work_area', 'activity': 'topic_head', 'floor': 'floor_zone',
+                    'description': 'discussion_decision', 'assigned': 'responsible_team',
+                    'deadline': 'target_date', 'status': 'completion_status'}
+
+
+def _point_from_cells(cells: List[str], roles: List[Optional[str]], index: int) -> DiscussionPoint:
+    """Map one markdown table row onto a DiscussionPoint"""
+    point = DiscussionPoint(sl_no=index, topic_head=f"Discussion Point {index}")
+    for cell, role in zip(cells, roles):
+        attribute = _ROLE_ATTRIBUTES.get(role)
+        if attribute and cell:
+            setattr(point, attribute, cell)
+    return point
+
+
+# JSON schema handed to Gemini for constrained (structured) output; it mirrors
+# MinutesOfMeeting so responses map onto the model without any re-parsing
+_STRING = {"type": "string"}
+MOM_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "meeting_header": {
+            "type": "object",
+            "properties": {f.name: _STRING for f in fields(MeetingHeader)},
+        },
+        "participants": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"consultant_organization": _STRING, "participant_name": _STRING},
+                "required": ["participant_name"],
+            },
+        },
+        "discussion_points": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {name: _STRING for name in (
+                    'topic_head', 'discussion_decision', 'responsible_team', 'target_date',
+                    'work_area', 'floor_zone', 'completion_status')},
+                "required": ["topic_head", "discussion_decision"],
+            },
+        },
+        "additional_info": {
+            "type": "object",
+            "properties": {
+                "distribution_list": _STRING,
+                "attachments": _STRING,
+                "next_meeting": {"type": "object", "properties": {"date": _STRING, "venue": _STRING}},
+                "response_deadline": _STRING,
+            },
+        },
+        "summary": _STRING,
+        "action_items": {"type": "array", "items": _STRING},
+    },
+    "required": ["meeting_header", "discussion_points"],
+}
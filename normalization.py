@@ -0,0 +1,274 @@
+# Normalization module for MoM Generator
+# Deterministic local clean-up of model output (dates, status, floors, defaults, numbering)
+
+import re
+from datetime import date
+from typing import TYPE_CHECKING, Any, Optional
+
+from config import Config
+
+if TYPE_CHECKING:
+    from mom_model import MinutesOfMeeting
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_ISO_DATE = re.compile(r'\b(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\b')
+_DMY_DATE = re.compile(r'\b(\d{1,2})[-/.](\d{1,2})[-/.](\d{4}|\d{2})\b')
+# The day may not run into the year ('May 2025' is not 20 May 2025): a two-digit
+# day is followed by a separator before a two- or four-digit year
+_DAY_MONTH_NAME = re.compile(
+    r'\b(\d{1,2})(?!\d)(?:st|nd|rd|th)?[\s\-/.,]*(?:of\s+)?([a-z]{3,9})[\s\-/.,]*(\d{4}|\d{2})\b', re.I)
+_MONTH_NAME_DAY = re.compile(
+    r'\b([a-z]{3,9})[\s\-/.]*(\d{1,2})(?!\d)(?:st|nd|rd|th)?(?:,\s*|[\s\-/.]+)(\d{4}|\d{2})\b', re.I)
+
+_PERCENT = re.compile(r'(\d{1,3}(?:\.\d+)?)\s*(?:%|percent\b|pc\b)', re.I)
+# Checked in order: 'not started' / 'to be started' must win over 'started', and
+# negated or future completion ('not completed', 'to be done') over 'completed'
+_NOT_STARTED = re.compile(
+    r'\b(?:not\s+(?:yet\s+)?started|(?:yet\s+)?to\s+(?:be\s+)?(?:start(?:ed)?|begin|commence[d]?))\b', re.I)
+_NOT_COMPLETED = re.compile(
+    r'\b(?:not|never|to\s+be)\s+(?:yet\s+)?(?:completed?|done|finished|closed)\b|\b(?:incomplete|unfinished)\b',
+    re.I)
+# Qualified progress ('partially done', 'almost completed') is not a finished item
+_PARTIAL = re.compile(r'\b(?:partial(?:ly)?|partly|in\s+part|almost|nearly|half|mostly|largely)\b', re.I)
+_STATUS_WORDS = (
+    (re.compile(r'\b(?:completed?|done|finished|closed)\b', re.I), 'Completed'),
+    (re.compile(r'\b(?:in[\s-]?progress|ongoing|on[\s-]?going|wip|started|under\s+way)\b', re.I), 'In Progress'),
+    (re.compile(r'\b(?:planned|pending|scheduled)\b', re.I), 'Planned'),
+    (re.compile(r'\b(?:on\s+hold|hold|stopped)\b', re.I), 'On Hold'),
+)
+
+_ORDINAL_FLOOR = r'(\d{1,3})\s*(?:st|nd|rd|th)?\s*(?:floor|flr|fl|f)\b'
+_UP_TO_FLOOR = re.compile(r'\b(?:up\s*to|upto|till|until)\s+' + _ORDINAL_FLOOR + r'|\b(?:up\s*to|upto|till|until)\s+(\d{1,3})\s*(?:st|nd|rd|th)\b', re.I)
+_FLOOR_NUMBER = re.compile(r'\b' + _ORDINAL_FLOOR + r'|\b(?:floor|flr|fl)\s*[-#:]?\s*(\d{1,3})\b', re.I)
+_GROUND_FLOOR = re.compile(r'\b(?:gf|g\.f\.?|ground(?:\s+floor)?)\b', re.I)
+# A bare 'B' means basement only at the start of the cell ('B2', not 'Block B2' or 'Lift B 3')
+_BASEMENT = re.compile(r'(?:\bbasement|^b)\s*[-#]?\s*(\d)\b', re.I)
+_ZONE = re.compile(r'\b(?:zone|zn)\s*[-#:]?\s*([a-z0-9]{1,3})\b', re.I)
+_TERRACE = re.compile(r'\b(?:terrace|roof(?:\s*top)?)\b', re.I)
+# What may remain of a floor cell once its floor and zone are recognised
+_FLOOR_LEFTOVER = re.compile(r'^[\s,;:/&()\-]*$')
+
+_EMPTY_VALUES = frozenset({'', '-', '--', 'na', 'n/a', 'nil', 'none', 'null', 'not specified',
+                           'not mentioned', 'unknown', '?'})
+_TBD_VALUES = frozenset({'tbd', 'tba', 'to be decided', 'to be confirmed', 'tbc', 'asap'})
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Parse the common date spellings found in minutes into a date, or None"""
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    match = _ISO_DATE.search(value)
+    if match:
+        year, month, day = (int(g) for g in match.groups())
+    else:
+        match = _DMY_DATE.search(value)
+        if match:
+            day, month, year = (int(g) for g in match.groups())
+        else:
+            match = _DAY_MONTH_NAME.search(value)
+            if match and match.group(2)[:3].lower() in _MONTHS:
+                day, month, year = int(match.group(1)), _MONTHS[match.group(2)[:3].lower()], int(match.group(3))
+            else:
+                match = _MONTH_NAME_DAY.search(value)
+                if not match or match.group(1)[:3].lower() not in _MONTHS:
+                    return None
+                day, month, year = int(match.group(2)), _MONTHS[match.group(1)[:3].lower()], int(match.group(3))
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def ordinal(n: int) -> str:
+    """1 -> '1st', 2 -> '2nd', 11 -> '11th'"""
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
+def is_empty(value: Any) -> bool:
+    """True for missing values and placeholders such as 'N/A' or '-'"""
+    return value is None or (isinstance(value, str) and value.strip().lower() in _EMPTY_VALUES)
+
+
+def normalize_date(value: Any, missing: str, date_format: str = Config.DATE_FORMAT) -> str:
+    """Format a date as date_format; placeholders become missing, TBD/other text is kept"""
+    if is_empty(value):
+        return missing
+    parsed = parse_date(value)
+    if parsed is not None:
+        return parsed.strftime(date_format)
+    text = str(value).strip()
+    return 'TBD' if text.lower() in _TBD_VALUES else text
+
+
+def normalize_status(value: Any, missing: str = '') -> str:
+    """Map free-form status text to Completed / In Progress / Planned / On Hold / NN%
+
+    Negated, future or partial completion ('not completed', 'to be done',
+    'partially done') is kept as written rather than guessed; an empty status
+    stays empty.
+    """
+    if is_empty(value):
+        return missing
+    text = str(value).strip()
+    match = _PERCENT.search(text)
+    if match:
+        percent = float(match.group(1))
+        if percent >= 100:
+            return 'Completed'
+        return f"{percent:g}%"
+    if _NOT_STARTED.search(text):
+        return 'Planned'
+    if _NOT_COMPLETED.search(text) or _PARTIAL.search(text):
+        return text
+    for pattern, label in _STATUS_WORDS:
+        if pattern.search(text):
+            return label
+    return text
+
+
+def normalize_floor(value: Any, missing: str) -> str:
+    """Normalize floor/zone names, e.g. '6 flr' -> '6th Floor', 'upto 10th' -> 'Up to 10th Floor'
+
+    Only cells made up entirely of one floor and/or one zone are rewritten;
+    anything else ('Tower B, 6th floor', 'GF to 3rd floor') is returned as written.
+    """
+    if is_empty(value):
+        return missing
+    text = str(value).strip()
+    parts = []
+    spans = []
+
+    up_to = _UP_TO_FLOOR.search(text)
+    ground = _GROUND_FLOOR.search(text)
+    floor = _FLOOR_NUMBER.search(text)
+    basement = _BASEMENT.search(text)
+    terrace = _TERRACE.search(text)
+    if up_to:
+        parts.append(f"Up to {ordinal(int(up_to.group(1) or up_to.group(2)))} Floor")
+        spans.append(up_to.span())
+    elif ground:
+        parts.append("Ground Floor")
+        spans.append(ground.span())
+    elif floor:
+        parts.append(f"{ordinal(int(floor.group(1) or floor.group(2)))} Floor")
+        spans.append(floor.span())
+    elif basement:
+        parts.append(f"Basement {basement.group(1)}")
+        spans.append(basement.span())
+    elif terrace:
+        parts.append("Terrace")
+        spans.append(terrace.span())
+
+    zone = _ZONE.search(text)
+    if zone and not any(start < zone.end() and zone.start() < end for start, end in spans):
+        parts.append(f"Zone {zone.group(1).upper()}")
+        spans.append(zone.span())
+
+    leftover = text
+    for start, end in sorted(spans, reverse=True):
+        leftover = leftover[:start] + " " + leftover[end:]
+    if not parts or not _FLOOR_LEFTOVER.match(leftover):
+        return text
+    return ", ".join(parts)
+
+
+class MoMNormalizer:
+    """Applies the formatting rules the prompts used to ask the model for"""
+
+    def __init__(self, config: Optional[Config] = None):
+        """Initialize normalizer with configuration defaults"""
+        self.config = config or Config()
+        self.not_specified = self.config.DEFAULT_VALUES['not_specified']
+        self.for_information = self.config.DEFAULT_VALUES['for_information']
+
+    def normalize_model(self, mom: "MinutesOfMeeting") -> "MinutesOfMeeting":
+        """Normalize a typed MinutesOfMeeting in place and return it"""
+        header = mom.meeting_header
+        header.meeting_date = normalize_date(header.meeting_date, self.not_specified, self.config.DATE_FORMAT)
+        for name in ('project_name', 'meeting_subject', 'meeting_time', 'venue', 'mom_number', 'minutes_by'):
+            if is_empty(getattr(header, name)):
+                setattr(header, name, self.not_specified)
+
+        for i, participant in enumerate(mom.participants, start=1):
+            participant.sl_no = i
+            if is_empty(participant.consultant_organization):
+                participant.consultant_organization = self.not_specified
+            if is_empty(participant.participant_name):
+                participant.participant_name = self.not_specified
+
+        for i, point in enumerate(mom.discussion_points, start=1):
+            point.sl_no = i
+            if is_empty(point.topic_head):
+                point.topic_head = f"Discussion Point {i}"
+            if is_empty(point.discussion_decision):
+                point.discussion_decision = self.not_specified
+            if is_empty(point.responsible_team):
+                point.responsible_team = self.not_specified
+            if point.target_date.strip().lower() != self.for_information.lower():
+                point.target_date = normalize_date(point.target_date, self.for_information,
+                                                   self.config.DATE_FORMAT)
+            if point.floor_zone:
+                point.floor_zone = normalize_floor(point.floor_zone, self.not_specified)
+            if point.completion_status:
+                point.completion_status = normalize_status(point.completion_status)
+
+        additional = mom.additional_info
+        if is_empty(additional.distribution_list):
+            additional.distribution_list = self.not_specified
+        if is_empty(additional.attachments):
+            additional.attachments = self.not_specified
+        additional.response_deadline = normalize_date(additional.response_deadline, self.not_specified,
+                                                      self.config.DATE_FORMAT)
+        additional.next_meeting.date = normalize_date(additional.next_meeting.date, self.not_specified,
+                                                      self.config.DATE_FORMAT)
+        if is_empty(additional.next_meeting.venue):
+            additional.next_meeting.venue = self.not_specified
+        return mom
+
+
+# Cells of the tabular (markdown) MoM are normalized to these formats
+_TABLE_DATE_FORMAT = "%d/%m/%Y"
+
+
+def normalize_table_model(mom: "MinutesOfMeeting") -> "MinutesOfMeeting":
+    """Apply the markdown-table cell rules to the points of a typed MoM, in place"""
+    for i, point in enumerate(mom.discussion_points, start=1):
+        point.sl_no = i
+        point.floor_zone = normalize_floor(point.floor_zone, 'Not Mentioned')
+        if is_empty(point.responsible_team):
+            point.responsible_team = 'Not Mentioned'
+        # The model's 'For Information' default means no deadline was given
+        target = '' if point.target_date == Config.DEFAULT_VALUES['for_information'] else point.target_date
+        point.target_date = normalize_date(target, 'TBD', _TABLE_DATE_FORMAT)
+        point.completion_status = normalize_status(point.completion_status)
+    return mom
+
+
+def column_role(header: str) -> Optional[str]:
+    """Classify a table header cell"""
+    header = header.lower()
+    if 'work area' in header:
+        return 'work_area'
+    if 'activity' in header or 'component' in header:
+        return 'activity'
+    if 'description' in header or 'remark' in header:
+        return 'description'
+    if 'floor' in header or 'zone' in header:
+        return 'floor'
+    if 'assigned' in header or 'responsib' in header:
+        return 'assigned'
+    if 'deadline' in header or 'date' in header:
+        return 'deadline'
+    if 'status' in header or '%' in header:
+        return 'status'
+    return None
@@ -0,0 +1,214 @@
+# Speculative extraction module for MoM Generator
+# Starts text extraction as soon as files are uploaded and caches the results per file
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import Config
+from text_pipeline import TextSegment
+from uploads import Upload, as_upload
+
+SegmentsFn = Callable[[Upload], Iterable[TextSegment]]
+
+
+def upload_key(uploaded_file) -> str:
+    """Content digest identifying an upload, shared by every session that uploads it"""
+    upload = as_upload(uploaded_file)
+    digest = hashlib.blake2b(upload.buffer(), digest_size=20)
+    return f"{digest.hexdigest()}-{upload.size}"
+
+
+class _Entry:
+    """In-flight or finished extraction of one upload"""
+
+    __slots__ = ("future", "cancel_event", "holders", "last_used")
+
+    def __init__(self, future: Future, cancel_event: threading.Event):
+        self.future = future
+        self.cancel_event = cancel_event
+        # Holder (session or API upload) -> monotonic deadline of its lease
+        self.holders: Dict[str, float] = {}
+        self.last_used = time.monotonic()
+
+
+class ExtractionCache:
+    """Process-wide cache of extraction results keyed by upload content
+
+    Entries are held through leases rather than plain reference counts: a holder
+    that disappears without releasing (a closed browser tab) stops protecting
+    its entries once its lease lapses.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_entries: Optional[int] = None,
+                 config: Optional[Config] = None):
+        """Create the cache and its extraction thread pool"""
+        self.config = config or Config()
+        self.max_entries = max_entries or self.config.PREFETCH_MAX_ENTRIES
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or self.config.PREFETCH_WORKERS,
+                                            thread_name_prefix="mom-prefetch")
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def acquire(self, key: str, upload: Upload, segments_fn: SegmentsFn, holder: str,
+                lease_seconds: Optional[float] = None) -> Future:
+        """Start (or join) the extraction of an upload and lease it to holder"""
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(key)
+            if entry is None or entry.future.cancelled():
+                cancel_event = threading.Event()
+                future = self._executor.submit(self._extract, upload, segments_fn, cancel_event)
+                entry = _Entry(future, cancel_event)
+                self._entries[key] = entry
+            self._lease(key, entry, holder, lease_seconds)
+            self._evict()
+            return entry.future
+
+    def renew(self, keys: Iterable[str], holder: str, lease_seconds: Optional[float] = None) -> None:
+        """Extend holder's leases on keys (called whenever the holder is active)"""
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._lease(key, entry, holder, lease_seconds)
+            self._evict()
+
+    def release(self, key: str, holder: str) -> None:
+        """End holder's lease; unfinished extractions nobody needs any more are cancelled"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.holders.pop(holder, None)
+            if not entry.holders and not entry.future.done():
+                self._drop(key)
+
+    def lookup(self, key: str) -> Optional[Future]:
+        """Return the extraction future for a key, if one was started"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.future if entry is not None else None
+
+    def segments(self, key: str, timeout: Optional[float] = None) -> Optional[List[TextSegment]]:
+        """Wait for a prefetched extraction; None if it was never started or failed"""
+        future = self.lookup(key)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout)
+        except Exception:
+            return None
+
+    def _lease(self, key: str, entry: _Entry, holder: str, lease_seconds: Optional[float]) -> None:
+        """Give holder a lease on an entry and mark it recently used (lock held)"""
+        now = time.monotonic()
+        entry.holders[holder] = now + (lease_seconds or self.config.PREFETCH_LEASE_SECONDS)
+        entry.last_used = now
+        self._entries.move_to_end(key)
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry, cancelling its extraction if it is still running (lock held)"""
+        entry = self._entries.pop(key)
+        if not entry.future.done():
+            entry.cancel_event.set()
+            entry.future.cancel()
+
+    def _evict(self) -> None:
+        """Expire lapsed leases, then drop unheld entries that are stale or beyond max_entries
+
+        Unfinished extractions whose holders all lapsed are cancelled; finished
+        ones are kept for re-uploads until PREFETCH_LEASE_SECONDS after their
+        last use, the oldest first once the cache is over max_entries (lock held).
+        """
+        now = time.monotonic()
+        stale_before = now - self.config.PREFETCH_LEASE_SECONDS
+        for key in list(self._entries):
+            entry = self._entries[key]
+            entry.holders = {h: deadline for h, deadline in entry.holders.items() if deadline > now}
+            if not entry.holders and (not entry.future.done() or entry.last_used < stale_before):
+                self._drop(key)
+
+        excess = len(self._entries) - self.max_entries
+        for key in list(self._entries):
+            if excess <= 0:
+                break
+            if not self._entries[key].holders:
+                self._drop(key)
+                excess -= 1
+
+    @staticmethod
+    def _extract(upload: Upload, segments_fn: SegmentsFn,
+                 cancel_event: threading.Event) -> List[TextSegment]:
+        """Run an extraction, checking for cancellation between segments"""
+        segments = []
+        try:
+            for segment in segments_fn(upload):
+                if cancel_event.is_set():
+                    raise CancelledError()
+                segments.append(segment)
+        finally:
+            # Releases the mmap and any file spooled for the extractor
+            upload.close()
+        return segments
+
+
+class UploadPrefetcher:
+    """Per-session view of the extraction cache that follows the file uploader"""
+
+    def __init__(self, cache: ExtractionCache, segments_fn: SegmentsFn, variant: str = ""):
+        """Bind the session to a cache and an extraction function
+
+        variant (e.g. the performance profile) is appended to the cache keys, so
+        extractions made with different settings are not shared.
+        """
+        self.cache = cache
+        self.segments_fn = segments_fn
+        self.variant = variant
+        self.holder = f"session:{uuid.uuid4().hex}"
+        self._keys: Dict[str, str] = {}
+
+    def sync(self, uploaded_files: List) -> List[str]:
+        """Start extraction of new uploads, cancel removed ones and return their keys
+
+        Every call also renews the session's leases, so the uploads of a session
+        that stops rerunning (a closed tab) expire after PREFETCH_LEASE_SECONDS.
+        """
+        keys = []
+        current = set()
+        for uploaded_file in uploaded_files:
+            upload = as_upload(uploaded_file)
+            file_ref = upload.file_id or f"{upload.name}:{upload.size}"
+            current.add(file_ref)
+            if file_ref not in self._keys:
+                key = upload_key(upload) + (f":{self.variant}" if self.variant else "")
+                self.cache.acquire(key, upload, self.segments_fn, self.holder)
+                self._keys[file_ref] = key
+            keys.append(self._keys[file_ref])
+
+        for file_ref in [ref for ref in self._keys if ref not in current]:
+            self.cache.release(self._keys.pop(file_ref), self.holder)
+        self.cache.renew(keys, self.holder)
+        return keys
+
+    def is_ready(self, key: str) -> bool:
+        """True when the extraction for key has finished"""
+        future = self.cache.lookup(key)
+        return future is not None and future.done()
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Return the process-wide extraction cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
@@ -0,0 +1,365 @@
+# Resource management module for MoM Generator
+# Keeps LLM clients, OCR/PDF engines and API key checks alive across Streamlit reruns
+
+import atexit
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytesseract
+from PIL import Image, ImageEnhance, ImageSequence
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain.schema import HumanMessage
+from config import Config
+from uploads import Upload, as_upload
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # PyMuPDF is optional, PyPDF2 is used as a fallback
+    fitz = None
+try:
+    import pdfplumber
+except ImportError:  # only used by the 'accurate' profile
+    pdfplumber = None
+import PyPDF2
+
+
+def _hash_key(api_key: str) -> str:
+    """Return a stable digest of an API key so raw keys are not used as cache keys"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class _CacheEntry:
+    """Cached resource together with its bookkeeping timestamps"""
+
+    __slots__ = ("value", "created_at", "last_used")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+def _merge_overlap(previous: List[str], following: List[str], max_lines: int = 5) -> List[str]:
+    """Drop the leading lines of a tile that repeat the trailing lines of the previous tile"""
+    prev_tail = [line.strip() for line in previous[-max_lines:]]
+    next_head = [line.strip() for line in following[:max_lines]]
+    for k in range(min(len(prev_tail), len(next_head)), 0, -1):
+        if prev_tail[-k:] == next_head[:k]:
+            return following[k:]
+    return following
+
+
+class OCREngine:
+    """Tesseract wrapper configured and warmed up once per process"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        tesseract_path = config.get_tesseract_path()
+        if tesseract_path != 'tesseract':
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        # Plotter scans exceed PIL's default decompression-bomb limit
+        Image.MAX_IMAGE_PIXELS = config.OCR_MAX_IMAGE_PIXELS
+        # Tesseract runs as a subprocess, so tiles can be OCR'd from threads;
+        # the pool is started on the first tiled frame and shut down by close()
+        self._tile_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.version = None
+
+    def warm_up(self) -> None:
+        """Resolve the tesseract binary so the first OCR call does not pay for it"""
+        try:
+            self.version = pytesseract.get_tesseract_version()
+        except Exception:
+            # Tesseract may be missing on hosts that never OCR anything
+            self.version = None
+
+    def close(self) -> None:
+        """Shut down the tile pool; a later tiled frame starts a new one"""
+        with self._pool_lock:
+            pool, self._tile_pool = self._tile_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _get_tile_pool(self) -> ThreadPoolExecutor:
+        """Return the tile pool, starting it on first use"""
+        with self._pool_lock:
+            if self._tile_pool is None:
+                self._tile_pool = ThreadPoolExecutor(max_workers=self.config.OCR_TILE_WORKERS,
+                                                     thread_name_prefix="mom-ocr-tile")
+            return self._tile_pool
+
+    def preprocessor(self) -> Optional[Callable[[Image.Image], Image.Image]]:
+        """The profile's image enhancement for iter_frames_text, or None when OCR_PREPROCESS is off"""
+        return self.enhance if self.config.OCR_PREPROCESS else None
+
+    def enhance(self, image: Image.Image) -> Image.Image:
+        """Raise contrast and sharpness by the profile's factors for better OCR"""
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        image = ImageEnhance.Contrast(image).enhance(self.config.OCR_CONTRAST)
+        return ImageEnhance.Sharpness(image).enhance(self.config.OCR_SHARPNESS)
+
+    def image_to_string(self, image, config: Optional[str] = None) -> str:
+        """Run OCR on a PIL image"""
+        return pytesseract.image_to_string(
+            image, config=config if config is not None else self.config.TESSERACT_CONFIG
+        )
+
+    def iter_frames_text(self, image: Image.Image, config: Optional[str] = None,
+                         preprocess: Optional[Callable[[Image.Image], Image.Image]] = None
+                         ) -> Iterator[Tuple[int, str]]:
+        """Yield (frame number, text) for every frame of a (multi-page) image
+
+        Frames are decoded one at a time and brought within the profile's
+        resolution bounds; frames still larger than OCR_TILE_MAX_PIXELS are
+        OCR'd as overlapping horizontal tiles in parallel.
+        """
+        for frame_num, frame in enumerate(ImageSequence.Iterator(image), start=1):
+            frame.load()
+            frame = self._fit_resolution(frame)
+            if frame.width * frame.height <= self.config.OCR_TILE_MAX_PIXELS:
+                tile = preprocess(frame) if preprocess else frame
+                yield frame_num, self.image_to_string(tile, config)
+            else:
+                yield frame_num, self._tiled_image_to_string(frame, config, preprocess)
+
+    def _fit_resolution(self, frame: Image.Image) -> Image.Image:
+        """Rescale a frame so its long side is within the profile's OCR resolution bounds"""
+        long_side = max(frame.size)
+        target = long_side
+        if self.config.OCR_MAX_LONG_SIDE_PX and long_side > self.config.OCR_MAX_LONG_SIDE_PX:
+            target = self.config.OCR_MAX_LONG_SIDE_PX
+        elif self.config.OCR_MIN_LONG_SIDE_PX and long_side < self.config.OCR_MIN_LONG_SIDE_PX:
+            target = self.config.OCR_MIN_LONG_SIDE_PX
+        if target == long_side or long_side == 0:
+            return frame
+        scale = target / long_side
+        size = (max(1, round(frame.width * scale)), max(1, round(frame.height * scale)))
+        return frame.resize(size, Image.LANCZOS if scale > 1 else Image.BILINEAR)
+
+    def _tiled_image_to_string(self, frame: Image.Image, config: Optional[str],
+                               preprocess: Optional[Callable[[Image.Image], Image.Image]]) -> str:
+        """OCR a large frame as overlapping strips and stitch the text in reading order"""
+        overlap = self.config.OCR_TILE_OVERLAP_PX
+        strip_height = max(self.config.OCR_TILE_MAX_PIXELS // frame.width, 4 * overlap)
+        boxes = [(0, max(top - overlap, 0), frame.width, min(top + strip_height, frame.height))
+                 for top in range(0, frame.height, strip_height)]
+
+        def ocr_box(box):
+            # Cropping inside the worker keeps at most one strip per thread in memory
+            tile = frame.crop(box)
+            if preprocess:
+                tile = preprocess(tile)
+            return self.image_to_string(tile, config)
+
+        lines: List[str] = []
+        for text in self._get_tile_pool().map(ocr_box, boxes):
+            tile_lines = [line for line in text.splitlines() if line.strip()]
+            lines.extend(_merge_overlap(lines, tile_lines))
+        return "\n".join(lines)
+
+
+class PDFEngine:
+    """PDF text extractor for the profile's backend, falling back to PyPDF2"""
+
+    def __init__(self, name: str = 'pypdf2'):
+        if name == 'pymupdf' and fitz is None:
+            name = 'pypdf2'
+        elif name == 'pdfplumber' and pdfplumber is None:
+            name = 'pymupdf' if fitz is not None else 'pypdf2'
+        self.name = name
+
+    def warm_up(self) -> None:
+        """Touch the backend once so lazy imports happen outside a request"""
+        if self.name == 'pymupdf':
+            fitz.TOOLS.mupdf_warnings()
+
+    def close(self) -> None:
+        """Nothing is held between calls; documents are closed as soon as they are read"""
+
+    def iter_pages(self, uploaded_file) -> Iterator[str]:
+        """Yield the text of each page of an uploaded PDF as soon as it is read"""
+        upload = as_upload(uploaded_file)
+        if self.name == 'pymupdf':
+            with self._open_document(upload) as doc:
+                for page in doc:
+                    yield page.get_text()
+            return
+        if self.name == 'pdfplumber':
+            # Slower, but keeps table rows and columns in reading order
+            with upload.open() as stream, pdfplumber.open(stream) as pdf:
+                for page in pdf.pages:
+                    yield page.extract_text() or ""
+                    page.flush_cache()
+            return
+        with upload.open() as stream:
+            reader = PyPDF2.PdfReader(stream)
+            for page in reader.pages:
+                yield page.extract_text() or ""
+
+    def extract_pages(self, uploaded_file) -> List[str]:
+        """Return the text of every page of an uploaded PDF"""
+        return list(self.iter_pages(uploaded_file))
+
+    def _open_document(self, upload: Upload):
+        """Open a PyMuPDF document, from disk for large uploads to avoid a second copy"""
+        if upload.is_large():
+            return fitz.open(upload.path(), filetype="pdf")
+        return fitz.open(stream=bytes(upload.buffer()), filetype="pdf")
+
+
+class ResourceManager:
+    """Process-wide cache of LLM clients, extraction engines and API key checks"""
+
+    def __init__(self, config: Optional[Config] = None):
+        """Initialize empty caches"""
+        self.config = config or Config()
+        self._lock = threading.RLock()
+        self._clients: "OrderedDict[Tuple[str, str, Optional[float], Optional[str]], _CacheEntry]" = OrderedDict()
+        self._engines: Dict[str, _CacheEntry] = {}
+        self._key_checks: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+
+    def get_llm(self, api_key: Optional[str], model: Optional[str] = None,
+                temperature: Optional[float] = None,
+                response_schema: Optional[Dict[str, Any]] = None) -> ChatGoogleGenerativeAI:
+        """Return a shared Gemini chat client for this key, model and temperature
+
+        With response_schema the client requests JSON output constrained to that schema.
+        """
+        model = model or self.config.GEMINI_MODEL
+        schema_key = _hash_key(json.dumps(response_schema, sort_keys=True)) if response_schema else None
+        cache_key = (_hash_key(api_key or ""), model, temperature, schema_key)
+
+        with self._lock:
+            self._evict_idle_clients()
+            entry = self._clients.get(cache_key)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                self._clients.move_to_end(cache_key)
+                return entry.value
+
+            if self.config.LLM_STUB:
+                from stub_llm import StubChatModel
+                client = StubChatModel(latency_seconds=self.config.LLM_STUB_LATENCY_MS / 1000,
+                                       structured=bool(response_schema))
+            else:
+                kwargs = {"model": model}
+                if api_key:
+                    kwargs["google_api_key"] = api_key
+                if temperature is not None:
+                    kwargs["temperature"] = temperature
+                if response_schema:
+                    kwargs["response_mime_type"] = "application/json"
+                    kwargs["response_schema"] = response_schema
+                client = ChatGoogleGenerativeAI(**kwargs)
+
+            self._clients[cache_key] = _CacheEntry(client)
+            while len(self._clients) > self.config.MAX_CACHED_CLIENTS:
+                self._clients.popitem(last=False)
+            return client
+
+    def get_ocr_engine(self, config: Optional[Config] = None) -> OCREngine:
+        """Return the warmed OCR engine for a performance profile (the process one by default)"""
+        config = config or self.config
+        return self._get_engine(f"ocr:{config.PERFORMANCE_PROFILE}", lambda: OCREngine(config))
+
+    def get_pdf_engine(self, config: Optional[Config] = None, default: str = 'pypdf2') -> PDFEngine:
+        """Return the warmed PDF engine for a performance profile (the process one by default)
+
+        default is the backend used when the profile does not choose one.
+        """
+        name = (config or self.config).PDF_ENGINE or default
+        return self._get_engine(f"pdf:{name}", lambda: PDFEngine(name))
+
+    def validate_api_key(self, api_key: str, model: Optional[str] = None) -> bool:
+        """Validate a Gemini API key, caching the verdict for a while"""
+        if not api_key or api_key.strip() == "":
+            return False
+
+        model = model or self.config.GEMINI_MODEL
+        check_key = (_hash_key(api_key), model)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._key_checks.get(check_key)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+
+        try:
+            llm = self.get_llm(api_key, model=model, temperature=0.1)
+            llm.invoke([HumanMessage(content="Test connection")])
+            is_valid = True
+        except Exception:
+            is_valid = False
+
+        ttl = (self.config.API_KEY_VALID_TTL_SECONDS if is_valid
+               else self.config.API_KEY_INVALID_TTL_SECONDS)
+        with self._lock:
+            self._key_checks[check_key] = (is_valid, now + ttl)
+        return is_valid
+
+    def evict_idle(self) -> None:
+        """Drop clients, engines and expired API key checks that outlived their idle TTL"""
+        with self._lock:
+            self._evict_idle_clients()
+            self._evict_idle_engines()
+            now = time.monotonic()
+            for key in [k for k, (_, expires) in self._key_checks.items() if expires <= now]:
+                del self._key_checks[key]
+
+    def clear(self) -> None:
+        """Release every cached client, engine and API key check"""
+        with self._lock:
+            self._clients.clear()
+            for entry in self._engines.values():
+                entry.value.close()
+            self._engines.clear()
+            self._key_checks.clear()
+
+    def _get_engine(self, name: str, factory):
+        """Create, warm up and cache an engine on first use"""
+        with self._lock:
+            self._evict_idle_engines()
+            entry = self._engines.get(name)
+            if entry is None:
+                engine = factory()
+                engine.warm_up()
+                entry = _CacheEntry(engine)
+                self._engines[name] = entry
+            entry.last_used = time.monotonic()
+            return entry.value
+
+    def _evict_idle_clients(self) -> None:
+        """Drop clients unused for longer than the idle TTL (lock must be held)"""
+        cutoff = time.monotonic() - self.config.RESOURCE_IDLE_TTL_SECONDS
+        for key in [k for k, entry in self._clients.items() if entry.last_used < cutoff]:
+            del self._clients[key]
+
+    def _evict_idle_engines(self) -> None:
+        """Close and drop engines unused for longer than the idle TTL (lock must be held)
+
+        Callers still holding an evicted engine can keep using it; its tile pool
+        is simply restarted on demand.
+        """
+        cutoff = time.monotonic() - self.config.RESOURCE_IDLE_TTL_SECONDS
+        for name in [n for n, entry in self._engines.items() if entry.last_used < cutoff]:
+            self._engines.pop(name).value.close()
+
+
+_manager: Optional[ResourceManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_resource_manager() -> ResourceManager:
+    """Return the process-wide resource manager, creating it on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ResourceManager()
+            atexit.register(_manager.clear)
+        return _manager
@@ -0,0 +1,338 @@
+# HTTP service module for MoM Generator
+# Async REST API sharing one extraction cache, LLM client pool and job queue across requests
+#
+#   POST   /uploads?profile=fast          multipart files -> upload IDs (extraction starts at once)
+#   DELETE /uploads/{upload_id}
+#   POST   /jobs                          {"uploads": [...], "format": "xlsx"|"docx", "profile": ...}
+#   GET    /jobs/{job_id}?wait=30         job state, long-polling until it finishes
+#   DELETE /jobs/{job_id}                 cancel
+#   GET    /jobs/{job_id}/exports/{fmt}   the generated .xlsx / .docx
+
+import argparse
+import asyncio
+import mimetypes
+import os
+import threading
+import time
+import uuid
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from aiohttp import hdrs, web
+
+from config import Config, PERFORMANCE_PROFILES
+from job_queue import JOB_DONE, FINISHED_STATES
+from mom_jobs import EXCEL_MOM_JOB, WORD_MOM_JOB, get_job_queue
+from prefetch import SegmentsFn, get_extraction_cache, upload_key
+from resource_manager import get_resource_manager
+from uploads import Upload
+
+_JOB_KINDS = {'xlsx': EXCEL_MOM_JOB, 'docx': WORD_MOM_JOB}
+_CHUNK_BYTES = 1 << 20
+_POLL_SECONDS = 0.1
+_PURGE_INTERVAL_SECONDS = 60
+
+
+class _StoredUpload:
+    """A file uploaded through the API: spooled to disk and held in the extraction cache
+
+    upload_id is random per request and upload carries that request's file
+    name and type; key (content hash, type and profile) only names the shared
+    extraction, so uploads of the same file share one copy on disk.
+    """
+
+    __slots__ = ("upload_id", "upload", "key", "profile", "expires")
+
+    def __init__(self, upload_id: str, upload: Upload, key: str, profile: str, expires: float):
+        self.upload_id = upload_id
+        self.upload = upload
+        self.key = key
+        self.profile = profile
+        self.expires = expires
+
+    def describe(self) -> Dict[str, Any]:
+        return {'upload_id': self.upload_id, 'name': self.upload.name, 'type': self.upload.type,
+                'size': self.upload.size, 'profile': self.profile}
+
+
+class MoMService:
+    """aiohttp front end over the process-wide extraction cache, resource manager and job queue"""
+
+    def __init__(self, config: Optional[Config] = None):
+        """Bind the service to the process-wide singletons"""
+        self.config = config or Config()
+        self.upload_dir = os.path.join(self.config.DATA_DIR, 'uploads')
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.cache = get_extraction_cache()
+        self.resources = get_resource_manager()
+        self.queue = get_job_queue()
+        self._lock = threading.Lock()
+        self._uploads: Dict[str, _StoredUpload] = {}
+        self._extractors: Dict[str, SegmentsFn] = {}
+        self._purge_task: Optional[asyncio.Task] = None
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application"""
+        app = web.Application()
+        app.add_routes([
+            web.get('/health', self.health),
+            web.post('/uploads', self.create_uploads),
+            web.delete('/uploads/{upload_id}', self.delete_upload),
+            web.post('/jobs', self.create_job),
+            web.get('/jobs/{job_id}', self.get_job),
+            web.delete('/jobs/{job_id}', self.cancel_job),
+            web.get('/jobs/{job_id}/exports/{format}', self.get_export),
+        ])
+        app.on_startup.append(self._start_purge)
+        app.on_cleanup.append(self._stop_purge)
+        return app
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok', 'profile': self.config.PERFORMANCE_PROFILE,
+                                  'uploads': len(self._uploads)})
+
+    async def create_uploads(self, request: web.Request) -> web.Response:
+        """Stream multipart files to disk and start extracting them in the background"""
+        profile = self._profile(request.query.get('profile'))
+        loop = asyncio.get_running_loop()
+        reader = await request.multipart()
+        created: List[_StoredUpload] = []
+        try:
+            while True:
+                part = await reader.next()
+                if part is None:
+                    break
+                if not part.filename:
+                    continue
+                name = os.path.basename(part.filename)
+                extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+                if extension not in self.config.SUPPORTED_FILE_TYPES:
+                    raise web.HTTPBadRequest(text=f"Unsupported file type: {extension}")
+                content_type = part.headers.get(hdrs.CONTENT_TYPE, '')
+                if not content_type or content_type == 'application/octet-stream':
+                    content_type = mimetypes.guess_type(name)[0] or ''
+                path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}_{name}")
+                await self._spool(part, path)
+                # Hashing and starting the extraction touch the whole file, so run off the event loop
+                created.append(await loop.run_in_executor(None, self._register, path, name,
+                                                          content_type, profile))
+        except web.HTTPException:
+            # A rejected file fails the whole request; drop the files accepted before it
+            with self._lock:
+                for stored in created:
+                    self._uploads.pop(stored.upload_id, None)
+            for stored in created:
+                await loop.run_in_executor(None, self._discard, stored)
+            raise
+
+        if not created:
+            raise web.HTTPBadRequest(text="No files in request")
+        return web.json_response({'uploads': [stored.describe() for stored in created]}, status=201)
+
+    async def delete_upload(self, request: web.Request) -> web.Response:
+        with self._lock:
+            stored = self._uploads.pop(request.match_info['upload_id'], None)
+        if stored is None:
+            raise web.HTTPNotFound(text="Unknown upload")
+        await asyncio.get_running_loop().run_in_executor(None, self._discard, stored)
+        return web.Response(status=204)
+
+    async def create_job(self, request: web.Request) -> web.Response:
+        """Submit a MoM generation job for previously uploaded files"""
+        try:
+            body = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Request body must be JSON")
+        upload_ids: List[str] = body.get('uploads') or []
+        if not upload_ids:
+            raise web.HTTPBadRequest(text="No uploads given")
+        export_format = body.get('format', 'xlsx')
+        if export_format not in _JOB_KINDS:
+            raise web.HTTPBadRequest(text=f"Unsupported format: {export_format}")
+        with self._lock:
+            stored = [self._uploads.get(upload_id) for upload_id in upload_ids]
+        if None in stored:
+            raise web.HTTPNotFound(text="Unknown or expired upload")
+
+        if export_format == 'docx' and len(stored) > 1:
+            raise web.HTTPBadRequest(text="A docx job takes a single upload")
+
+        profile = self._profile(body.get('profile') or stored[0].profile)
+        # Extractions made with another profile are not reused; the job extracts again.
+        # Word jobs read images with Gemini vision, so the OCR prefetch never applies to them
+        if export_format == 'docx':
+            prefetch_keys = None
+        else:
+            prefetch_keys = [s.key if s.profile == profile else None for s in stored]
+        api_key = (request.headers.get('X-Gemini-Api-Key') or body.get('api_key')
+                   or self.config.get_gemini_api_key())
+
+        submit = partial(self.queue.submit, _JOB_KINDS[export_format],
+                         {'prefetch_keys': prefetch_keys, 'profile': profile},
+                         [s.upload for s in stored], secrets={'api_key': api_key})
+        job_id = await asyncio.get_running_loop().run_in_executor(None, submit)
+        return web.json_response({'job_id': job_id, 'status_url': f"/jobs/{job_id}"}, status=202)
+
+    async def get_job(self, request: web.Request) -> web.Response:
+        """Return a job's state; with ?wait=N, wait up to N seconds for it to finish"""
+        job_id = request.match_info['job_id']
+        try:
+            wait = min(float(request.query.get('wait', 0)), self.config.SERVICE_MAX_WAIT_SECONDS)
+        except ValueError:
+            raise web.HTTPBadRequest(text="wait must be a number of seconds")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+
+        job = await loop.run_in_executor(None, self.queue.get, job_id)
+        while job is not None and job['status'] not in FINISHED_STATES and loop.time() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            job = await loop.run_in_executor(None, self.queue.get, job_id)
+        if job is None:
+            raise web.HTTPNotFound(text="Unknown job")
+        return web.json_response(self._describe(job))
+
+    async def cancel_job(self, request: web.Request) -> web.Response:
+        job_id = request.match_info['job_id']
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.queue.get, job_id) is None:
+            raise web.HTTPNotFound(text="Unknown job")
+        await loop.run_in_executor(None, self.queue.cancel, job_id)
+        return web.Response(status=202)
+
+    async def get_export(self, request: web.Request) -> web.StreamResponse:
+        """Download a finished job's export"""
+        job = await asyncio.get_running_loop().run_in_executor(
+            None, self.queue.get, request.match_info['job_id'])
+        if job is None:
+            raise web.HTTPNotFound(text="Unknown job")
+        if job['status'] != JOB_DONE:
+            raise web.HTTPConflict(text=f"Job is {job['status']}")
+        export_format = request.match_info['format']
+        path = (job['result'] or {}).get('exports', {}).get(export_format)
+        if not path or not os.path.exists(path):
+            raise web.HTTPNotFound(text=f"No {export_format} export for this job")
+        return web.FileResponse(path, headers={
+            hdrs.CONTENT_DISPOSITION: f'attachment; filename="{os.path.basename(path)}"'})
+
+    def _profile(self, name: Optional[str]) -> str:
+        """Validate a requested performance profile, defaulting to the service's one"""
+        name = name or self.config.PERFORMANCE_PROFILE
+        if name not in PERFORMANCE_PROFILES:
+            raise web.HTTPBadRequest(text=f"Unknown profile: {name}")
+        return name
+
+    async def _spool(self, part, path: str) -> None:
+        """Write a multipart part to disk chunk by chunk, enforcing MAX_FILE_SIZE_MB"""
+        limit = self.config.MAX_FILE_SIZE_MB * 1024 * 1024
+        size = 0
+        with open(path, 'wb') as out:
+            while True:
+                chunk = await part.read_chunk(_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    break
+                out.write(chunk)
+        if size > limit:
+            os.remove(path)
+            raise web.HTTPRequestEntityTooLarge(max_size=limit, actual_size=size)
+
+    def _register(self, path: str, name: str, content_type: str, profile: str) -> _StoredUpload:
+        """Validate an upload, give it its own ID and start (or join) its extraction (worker thread)"""
+        upload = Upload(path, name=name, type=content_type, config=self.config)
+        if not upload.matches_extension():
+            upload.close()
+            os.remove(path)
+            raise web.HTTPBadRequest(text=f"File content does not match its extension: {name}")
+        key = f"{upload_key(upload)}:{content_type}:{profile}"
+        upload_id = uuid.uuid4().hex
+        expires = time.monotonic() + self.config.SERVICE_UPLOAD_TTL_SECONDS
+        with self._lock:
+            shared = next((s for s in self._uploads.values() if s.key == key), None)
+            if shared is not None:
+                # Same content was uploaded before: reuse its copy on disk and its extraction,
+                # keeping this request's own file name
+                upload.close()
+                os.remove(path)
+                upload = Upload(shared.upload.path(), name=name, type=content_type, config=self.config)
+            # Each upload ID holds its own lease, released when that ID is deleted or expires
+            self.cache.acquire(key, upload, self._extractor(profile), upload_id,
+                               self.config.SERVICE_UPLOAD_TTL_SECONDS + _PURGE_INTERVAL_SECONDS)
+            stored = self._uploads[upload_id] = _StoredUpload(upload_id, upload, key, profile, expires)
+        return stored
+
+    def _extractor(self, profile: str) -> SegmentsFn:
+        """Extraction function for a profile (lock held)"""
+        if profile not in self._extractors:
+            # Same extractor as the Excel job, so a prefetch equals what the job would extract
+            from generator import iter_file_segments
+            self._extractors[profile] = partial(iter_file_segments, config=Config(profile))
+        return self._extractors[profile]
+
+    def _discard(self, stored: _StoredUpload) -> None:
+        """Release an upload's extraction lease and delete its file once no other upload shares it"""
+        self.cache.release(stored.key, stored.upload_id)
+        path = stored.upload.path()
+        stored.upload.close()
+        with self._lock:
+            if any(s.upload.path() == path for s in self._uploads.values()):
+                return
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Public view of a job; export paths are replaced by download URLs"""
+        result = dict(job['result'] or {})
+        exports = result.pop('exports', {})
+        return {
+            'job_id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'progress': job['progress'],
+            'message': job['message'],
+            'error': job['error'],
+            'result': result or None,
+            'exports': {fmt: f"/jobs/{job['id']}/exports/{fmt}" for fmt in exports},
+        }
+
+    def _purge_expired(self) -> None:
+        """Drop expired uploads, idle LLM clients and old jobs (worker thread)"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s in self._uploads.values() if s.expires <= now]
+            for stored in expired:
+                del self._uploads[stored.upload_id]
+        for stored in expired:
+            self._discard(stored)
+        self.resources.evict_idle()
+        self.queue.purge_expired()
+
+    async def _start_purge(self, app: web.Application) -> None:
+        async def purge_loop():
+            loop = asyncio.get_running_loop()
+            while True:
+                await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+                await loop.run_in_executor(None, self._purge_expired)
+        self._purge_task = asyncio.create_task(purge_loop())
+
+    async def _stop_purge(self, app: web.Application) -> None:
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MoM Generator HTTP service")
+    parser.add_argument('--host', default=Config.SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVICE_PORT)
+    parser.add_argument('--profile', choices=list(PERFORMANCE_PROFILES), default=Config.PERFORMANCE_PROFILE,
+                        help="default performance profile; also sizes the worker pools and caches")
+    args = parser.parse_args()
+
+    # Must be set before the process-wide singletons are created
+    Config.PERFORMANCE_PROFILE = args.profile
+    web.run_app(MoMService().create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Stub LLM module for MoM Generator
+# Offline stand-in for Gemini, used for load tests and local development (MOM_LLM_STUB=1)
+
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Instructions end with one of these markers; the meeting text follows
+_INPUT_MARKER = re.compile(r'(?:TEXT:|Notes:|input:)', re.I)
+_WORD = re.compile(r'[A-Za-z]{2,}')
+MAX_POINTS = 25
+
+
+def _input_lines(prompt: str) -> List[str]:
+    """Non-empty lines of the meeting text embedded in a prompt"""
+    parts = _INPUT_MARKER.split(prompt)
+    text = parts[-1] if len(parts) > 1 else prompt
+    return [line.strip() for line in text.splitlines() if _WORD.search(line)]
+
+
+def stub_mom(prompt: str) -> Dict[str, Any]:
+    """A MoM (as JSON data) with one discussion point per line of input"""
+    points = []
+    for line in _input_lines(prompt)[:MAX_POINTS]:
+        words = line.split()
+        points.append({
+            'topic_head': " ".join(words[:6]),
+            'discussion_decision': line,
+            'responsible_team': 'Site Team',
+            'target_date': 'TBD',
+        })
+    return {
+        'meeting_header': {'project_name': 'Stub Project', 'meeting_subject': 'Load test'},
+        'participants': [{'consultant_organization': 'Stub Consultants', 'participant_name': 'Stub User'}],
+        'discussion_points': points,
+        'additional_info': {},
+        'summary': f"{len(points)} discussion points recorded.",
+        'action_items': [point['topic_head'] for point in points[:5]],
+    }
+
+
+def stub_markdown(prompt: str) -> str:
+    """A tabular (markdown) MoM with one row per line of input"""
+    lines = [
+        "| Work Area | Sub-Activity/Component | Floor/Zone/Section | Description / Remarks | "
+        "Assigned To (if any) | Deadline (DD/MM/YYYY) | Status / Completion % |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for line in _input_lines(prompt)[:MAX_POINTS]:
+        lines.append(f"| Civil | {' '.join(line.split()[:6])} |  | {line.replace('|', '/')} |  |  | Planned |")
+    return "\n".join(lines + ["", "Summary & Key Action Items", "- Review open items"])
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model that answers like Gemini after a fixed latency, without any network calls"""
+
+    latency_seconds: float = 0.0
+    structured: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "mom-stub"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        """Sleep for the configured latency, then return a MoM built from the prompt"""
+        time.sleep(self.latency_seconds)
+        prompt = str(messages[-1].content) if messages else ""
+        if self.structured or "| Work Area |" not in prompt:
+            content = json.dumps(stub_mom(prompt))
+        else:
+            content = stub_markdown(prompt)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
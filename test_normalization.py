@@ -0,0 +1,103 @@
+# Tests for the normalization module
+# Run with: python -m pytest -q
+
+from datetime import date
+
+import pytest
+
+from mom_model import DiscussionPoint, MinutesOfMeeting
+from normalization import normalize_floor, normalize_status, normalize_table_model, parse_date
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Completed", "Completed"),
+    ("done", "Completed"),
+    ("100%", "Completed"),
+    ("90 %", "90%"),
+    ("WIP", "In Progress"),
+    ("Started", "In Progress"),
+    ("pending", "Planned"),
+    ("On hold", "On Hold"),
+    ("not started", "Planned"),
+    ("Not yet started", "Planned"),
+    ("yet to start", "Planned"),
+    ("to be started", "Planned"),
+    # Negated or future completion is kept as written, never flipped to Completed
+    ("Not completed", "Not completed"),
+    ("to be completed", "to be completed"),
+    ("work not done", "work not done"),
+    ("incomplete", "incomplete"),
+    # Partial progress is kept as written, never flipped to Completed
+    ("partially done", "partially done"),
+    ("almost done", "almost done"),
+    ("half done", "half done"),
+    ("nearly completed", "nearly completed"),
+    ("done partly", "done partly"),
+])
+def test_normalize_status(text, expected):
+    assert normalize_status(text) == expected
+
+
+def test_normalize_status_keeps_empty_status_empty():
+    assert normalize_status("") == ""
+    assert normalize_status(None) == ""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("30/05/2025", date(2025, 5, 30)),
+    ("2025-05-30", date(2025, 5, 30)),
+    ("20 May 2025", date(2025, 5, 20)),
+    ("5th of June 2025", date(2025, 6, 5)),
+    ("May 20, 2025", date(2025, 5, 20)),
+    ("May 20 2025", date(2025, 5, 20)),
+    ("March 5 25", date(2025, 3, 5)),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize("text", ["May 2025", "by end of march 2025", "June-2025", "TBD"])
+def test_parse_date_without_day_is_none(text):
+    assert parse_date(text) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("6 flr", "6th Floor"),
+    ("Floor 6", "6th Floor"),
+    ("upto 10th", "Up to 10th Floor"),
+    ("Ground floor", "Ground Floor"),
+    ("GF", "Ground Floor"),
+    ("B2", "Basement 2"),
+    ("B-1, Zone a", "Basement 1, Zone A"),
+    ("6th floor zone B", "6th Floor, Zone B"),
+    ("Roof top", "Terrace"),
+    ("", "Not Mentioned"),
+])
+def test_normalize_floor(text, expected):
+    assert normalize_floor(text, "Not Mentioned") == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Tower B, 6th floor",
+    "Ground to 5th floor",
+    "GF to 3rd floor",
+    "1st & 2nd floor",
+    "Lift B 3",
+    "Block B2",
+])
+def test_normalize_floor_keeps_partially_recognised_cells(text):
+    assert normalize_floor(text, "Not Mentioned") == text
+
+
+def test_normalize_table_model_does_not_invent_status():
+    mom = MinutesOfMeeting(discussion_points=[
+        DiscussionPoint(sl_no=1, topic_head="Shaft wall", target_date="May 2025"),
+        DiscussionPoint(sl_no=2, topic_head="Store", completion_status="not started"),
+    ])
+    normalize_table_model(mom)
+    first, second = mom.discussion_points
+    assert first.completion_status == ""
+    assert first.target_date == "May 2025"
+    assert first.floor_zone == "Not Mentioned"
+    assert second.completion_status == "Planned"
+    assert second.target_date == "TBD"
@@ -1,36 +1,41 @@
-import pytesseract
 from PIL import Image
-import fitz  # PyMuPDF
 import docx2txt
 import pandas as pd
 import io
+from resource_manager import get_resource_manager
+from text_pipeline import TextSegment
+from uploads import as_upload
 
-# Set the tesseract path manually
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-
-def extract_text_from_file(uploaded_file):
+def iter_text_from_file(uploaded_file, config=None):
+    """Yield TextSegment(source, page, text) items as each page is extracted"""
+    uploaded_file = as_upload(uploaded_file)
     file_type = uploaded_file.type
+    name = uploaded_file.name
     if file_type in ["image/jpeg", "image/png"]:
         image = Image.open(uploaded_file)
-        return pytesseract.image_to_string(image)
+        ocr_engine = get_resource_manager().get_ocr_engine(config)
+        frames = ocr_engine.iter_frames_text(image, preprocess=ocr_engine.preprocessor())
+        yield TextSegment(name, 1, "\n".join(text for _, text in frames))
 
     elif file_type == "application/pdf":
-        text = ""
-        with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text()
-        return text
+        pages = get_resource_manager().get_pdf_engine(config, default='pymupdf').iter_pages(uploaded_file)
+        for page_num, page_text in enumerate(pages, start=1):
+            yield TextSegment(name, page_num, page_text)
 
     elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return docx2txt.process(uploaded_file)
+        yield TextSegment(name, 1, docx2txt.process(uploaded_file))
 
     elif file_type == "text/plain":
-        return uploaded_file.read().decode("utf-8")
+        yield TextSegment(name, 1, str(uploaded_file.buffer(), "utf-8"))
 
     elif file_type in ["application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]:
         df = pd.read_excel(uploaded_file)
-        return df.to_string(index=False)
+        yield TextSegment(name, 1, df.to_string(index=False))
 
     else:
-        return "Unsupported file type"
\ No newline at end of file
+        yield TextSegment(name, 1, "Unsupported file type")
+
+
+def extract_text_from_file(uploaded_file, config=None):
+    return "".join(segment.text for segment in iter_text_from_file(uploaded_file, config))
\ No newline at end of file
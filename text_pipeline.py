@@ -0,0 +1,60 @@
+# Streaming text pipeline for MoM Generator
+# Extractors yield (source, page, text) segments that downstream steps consume lazily
+
+import hashlib
+import re
+from typing import Iterable, Iterator, List, NamedTuple
+
+
+class TextSegment(NamedTuple):
+    """A piece of extracted text: file name, 1-based page (or frame) and its text"""
+    source: str
+    page: int
+    text: str
+
+
+_WHITESPACE_RUN = re.compile(r'[ \t\f\v]+')
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+def compact_segments(segments: Iterable[TextSegment]) -> Iterator[TextSegment]:
+    """Collapse runs of spaces and blank lines, dropping segments left empty"""
+    for segment in segments:
+        text = _BLANK_LINES.sub('\n\n', _WHITESPACE_RUN.sub(' ', segment.text)).strip()
+        if text:
+            yield segment._replace(text=text)
+
+
+def dedupe_segments(segments: Iterable[TextSegment]) -> Iterator[TextSegment]:
+    """Drop segments whose text was already seen (e.g. the same page uploaded twice)"""
+    seen = set()
+    for segment in segments:
+        digest = hashlib.blake2b(segment.text.lower().encode('utf-8'), digest_size=16).digest()
+        if digest not in seen:
+            seen.add(digest)
+            yield segment
+
+
+def render_segments(segments: Iterable[TextSegment]) -> Iterator[str]:
+    """Render segments as text parts with a header whenever the source file changes"""
+    current_source = None
+    for segment in segments:
+        if segment.source != current_source:
+            current_source = segment.source
+            yield f"\n\n--- {segment.source} ---\n"
+        yield segment.text
+        yield "\n"
+
+
+def chunk_segments(segments: Iterable[TextSegment], max_chars: int) -> Iterator[str]:
+    """Group rendered segments into text chunks of roughly max_chars characters"""
+    parts: List[str] = []
+    size = 0
+    for part in render_segments(segments):
+        parts.append(part)
+        size += len(part)
+        if size >= max_chars:
+            yield "".join(parts)
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts)
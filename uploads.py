@@ -0,0 +1,203 @@
+# Upload handling module for MoM Generator
+# Gives extractors size, type and content access to uploads without copying them
+
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Optional
+
+from config import Config
+
+# Leading bytes of the binary formats we accept, by file extension
+_MAGIC_NUMBERS = {
+    'pdf': (b'%PDF',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'tiff': (b'II*\x00', b'MM\x00*'),
+    'tif': (b'II*\x00', b'MM\x00*'),
+    'bmp': (b'BM',),
+    'docx': (b'PK\x03\x04',),
+}
+
+
+class Upload:
+    """Uploaded file backed either by an in-memory buffer or by a file on disk
+
+    Streamlit uploads are already held in memory, so their bytes are exposed
+    through a zero-copy memoryview. Large uploads can be spooled to disk once
+    with path(); files on disk are read through mmap. Upload is itself a
+    read-only binary stream, so it can be passed straight to PIL, PyPDF2 or
+    mammoth. Each Upload keeps its own read position, so several wrappers
+    (and threads) can read the same UploadedFile without moving its cursor.
+    """
+
+    def __init__(self, source, name: Optional[str] = None, type: Optional[str] = None,
+                 config: Optional[Config] = None):
+        """Wrap a Streamlit UploadedFile, BytesIO or path"""
+        self.config = config or Config()
+        self._memory: Optional[io.BytesIO] = None
+        self._path: Optional[str] = None
+        self._spooled_path: Optional[str] = None
+        self._spool_finalizer: Optional[weakref.finalize] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._pos = 0
+
+        if isinstance(source, (str, os.PathLike)):
+            self._path = os.fspath(source)
+            self.name = name or os.path.basename(self._path)
+        else:
+            self._memory = source
+            self.name = name or getattr(source, 'name', 'upload')
+        self.type = type or getattr(source, 'type', '') or ''
+        self.file_id = getattr(source, 'file_id', None)
+
+    @property
+    def extension(self) -> str:
+        """Lowercase file extension without the dot"""
+        return self.name.rsplit('.', 1)[-1].lower() if '.' in self.name else ''
+
+    @property
+    def size(self) -> int:
+        """Size in bytes, computed without reading the content"""
+        if self._path is not None:
+            return os.path.getsize(self._path)
+        size = getattr(self._memory, 'size', None)
+        if isinstance(size, int):
+            return size
+        return self._memory.getbuffer().nbytes
+
+    @property
+    def size_mb(self) -> float:
+        """Size in megabytes"""
+        return self.size / (1024 * 1024)
+
+    def head(self, n: int = 16) -> bytes:
+        """Return the first n bytes (used to sniff the real file type)"""
+        return bytes(self.buffer()[:n])
+
+    def matches_extension(self) -> bool:
+        """Check that the leading bytes agree with the extension, when it has a signature"""
+        signatures = _MAGIC_NUMBERS.get(self.extension)
+        if not signatures:
+            return True
+        head = self.head()
+        return any(head.startswith(signature) for signature in signatures)
+
+    def buffer(self) -> memoryview:
+        """Zero-copy view of the content (memory buffer or read-only mmap)"""
+        if self._memory is not None:
+            return self._memory.getbuffer()
+        if self._mmap is None:
+            path = self.path()
+            if os.path.getsize(path) == 0:
+                return memoryview(b'')
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def path(self) -> str:
+        """Return a path to the content on disk, spooling an in-memory upload once"""
+        if self._path is not None:
+            return self._path
+        if self._spooled_path is None:
+            os.makedirs(self.config.UPLOAD_SPOOL_DIR, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.config.UPLOAD_SPOOL_DIR, delete=False,
+                                             suffix=f".{self.extension}") as tmp:
+                tmp.write(self._memory.getbuffer())
+            self._spooled_path = tmp.name
+            # Removed on close(), or when the Upload is garbage collected
+            self._spool_finalizer = weakref.finalize(self, _remove_file, tmp.name)
+        return self._spooled_path
+
+    def is_large(self) -> bool:
+        """True when the upload is above the spool threshold"""
+        return self.size > self.config.UPLOAD_SPOOL_THRESHOLD_MB * 1024 * 1024
+
+    def save_to(self, dest_path: str) -> None:
+        """Write the content to dest_path without an intermediate copy"""
+        if self._path is not None:
+            shutil.copyfile(self._path, dest_path)
+            return
+        with open(dest_path, 'wb') as out:
+            out.write(self.buffer())
+
+    def open(self):
+        """Return a fresh binary stream over the content, positioned at the start"""
+        if self._path is not None:
+            return open(self._path, 'rb')
+        return Upload(self._memory, name=self.name, type=self.type, config=self.config)
+
+    # Minimal read-only stream interface so an Upload can stand in for a file object;
+    # reads are slices of buffer(), so the wrapped file's own cursor is never used
+    def read(self, n: Optional[int] = -1) -> bytes:
+        buffer = self.buffer()
+        end = len(buffer) if n is None or n < 0 else min(self._pos + n, len(buffer))
+        data = bytes(buffer[self._pos:end])
+        self._pos = max(self._pos, end)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._pos = position
+        return position
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def getbuffer(self) -> memoryview:
+        return self.buffer()
+
+    def close(self) -> None:
+        """Release the mmap and any spooled temporary file"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds a view; the mapping is freed with it
+                pass
+            self._mmap = None
+        if self._spool_finalizer is not None:
+            self._spool_finalizer()
+            self._spool_finalizer = None
+        self._spooled_path = None
+        self._pos = 0
+
+    def __enter__(self) -> "Upload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _remove_file(path: str) -> None:
+    """Delete a spooled file, ignoring files that are already gone"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def as_upload(uploaded_file) -> Upload:
+    """Wrap a Streamlit upload (or pass an Upload through unchanged)"""
+    if isinstance(uploaded_file, Upload):
+        return uploaded_file
+    return Upload(uploaded_file)